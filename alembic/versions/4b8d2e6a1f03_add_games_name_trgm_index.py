@@ -0,0 +1,30 @@
+"""add trigram index on games.name
+
+Revision ID: 4b8d2e6a1f03
+Revises: 2f7a1c9b7e10
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+revision = "4b8d2e6a1f03"
+down_revision = "2f7a1c9b7e10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm ships with the stock postgres image (contrib)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Serves both ILIKE '%...%' substring matches and the fuzzy '%' similarity operator
+    op.create_index(
+        "ix_games_name_trgm",
+        "games",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_name_trgm", table_name="games")
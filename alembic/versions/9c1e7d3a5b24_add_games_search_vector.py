@@ -0,0 +1,40 @@
+"""add full-text search vector to games
+
+Revision ID: 9c1e7d3a5b24
+Revises: 4b8d2e6a1f03
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "9c1e7d3a5b24"
+down_revision = "4b8d2e6a1f03"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("games", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill with the same expression utils.search_index maintains on writes
+    op.execute(
+        """
+        UPDATE games g SET search_vector =
+            setweight(to_tsvector('english', coalesce(g.name, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(
+                (SELECT c.name FROM collections c WHERE c.id = g.collection_id), '')), 'B')
+            || setweight(to_tsvector('english', coalesce(
+                (SELECT string_agg(co.name, ' ')
+                   FROM game_companies gc JOIN companies co ON co.id = gc.company_id
+                  WHERE gc.game_id = g.id), '')), 'B')
+            || setweight(to_tsvector('english', coalesce(g.summary, '')), 'C')
+        """
+    )
+
+    op.create_index("ix_games_search_vector", "games", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_search_vector", table_name="games")
+    op.drop_column("games", "search_vector")
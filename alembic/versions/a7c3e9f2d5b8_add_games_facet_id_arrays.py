@@ -0,0 +1,48 @@
+"""add denormalized, GIN-indexed facet ID arrays to games
+
+Revision ID: a7c3e9f2d5b8
+Revises: f1a6d4e8b2c7
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "a7c3e9f2d5b8"
+down_revision = "f1a6d4e8b2c7"
+branch_labels = None
+depends_on = None
+
+# games column -> (association table, value column)
+ARRAYS = {
+    "platform_ids": ("game_platforms", "platform_id"),
+    "tag_ids": ("game_tags", "tag_id"),
+    "genre_ids": ("game_genres", "genre_id"),
+    "mode_ids": ("game_modes", "mode_id"),
+    "perspective_ids": ("game_playerperspectives", "perspective_id"),
+    "company_ids": ("game_companies", "company_id"),
+    "igdb_tag_ids": ("game_igdb_tags", "igdb_tag_id"),
+}
+
+
+def upgrade() -> None:
+    for column, (table, value_col) in ARRAYS.items():
+        op.add_column(
+            "games",
+            sa.Column(column, postgresql.ARRAY(sa.Integer()), nullable=False, server_default="{}"),
+        )
+        op.execute(
+            f"""
+            UPDATE games g SET {column} = ARRAY(
+                SELECT a.{value_col} FROM {table} a WHERE a.game_id = g.id ORDER BY a.{value_col}
+            )
+            """
+        )
+        # && / @> / <@ for the any / all / exact match modes
+        op.create_index(f"ix_games_{column}", "games", [column], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    for column in reversed(list(ARRAYS)):
+        op.drop_index(f"ix_games_{column}", table_name="games")
+        op.drop_column("games", column)
@@ -0,0 +1,47 @@
+"""log saved-search changes instead of patching saved searches on commit
+
+Revision ID: a9e3d7c5f2b1
+Revises: c4e9a7b3d1f6
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "a9e3d7c5f2b1"
+down_revision = "c4e9a7b3d1f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_search_changes",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("game_id", sa.Integer(), nullable=True),
+        sa.Column("xid", sa.BigInteger(), nullable=False, server_default=sa.text("txid_current()")),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_saved_search_changes_xid", "saved_search_changes", ["xid"], unique=False)
+
+    # Stale sets are caught up by one "any game" change every saved search still has to apply
+    op.add_column(
+        "saved_searches", sa.Column("changes_seen", sa.BigInteger(), nullable=False, server_default="0")
+    )
+    op.execute(
+        "INSERT INTO saved_search_changes (game_id) "
+        "SELECT NULL WHERE EXISTS (SELECT 1 FROM saved_searches WHERE built_version <> dirty_version)"
+    )
+    op.drop_column("saved_searches", "built_version")
+    op.drop_column("saved_searches", "dirty_version")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "saved_searches", sa.Column("dirty_version", sa.Integer(), nullable=False, server_default="1")
+    )
+    op.add_column(
+        "saved_searches", sa.Column("built_version", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.drop_column("saved_searches", "changes_seen")
+    op.drop_index("ix_saved_search_changes_xid", table_name="saved_search_changes")
+    op.drop_table("saved_search_changes")
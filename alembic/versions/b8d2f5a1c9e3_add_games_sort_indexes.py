@@ -0,0 +1,71 @@
+"""add created_at, location_key and sort indexes to games
+
+Revision ID: b8d2f5a1c9e3
+Revises: a7c3e9f2d5b8
+Create Date: 2026-10-16 00:00:00
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from unidecode import unidecode
+
+revision = "b8d2f5a1c9e3"
+down_revision = "a7c3e9f2d5b8"
+branch_labels = None
+depends_on = None
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text):
+    # Frozen copy of utils.search_index.normalize_name
+    folded = unidecode(text or "").lower().replace("'", "")
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # No add time was ever recorded (updated_at is IGDB's edit time, not ours), so existing
+    # games get 0: under sort=added they come first, in id order, which is the order they
+    # were inserted. Games created from now on carry their real creation time.
+    op.add_column("games", sa.Column("created_at", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("games", sa.Column("location_key", sa.String(), nullable=False, server_default=""))
+
+    locations = {
+        row_id: (parent_id, name)
+        for row_id, parent_id, name in conn.execute(sa.text("SELECT id, parent_id, name FROM locations"))
+    }
+
+    def path_key(location_id):
+        parts, seen = [], set()
+        while location_id in locations and location_id not in seen:
+            seen.add(location_id)
+            parent_id, name = locations[location_id]
+            parts.append(_normalize(name))
+            location_id = parent_id
+        return " / ".join(reversed(parts))
+
+    used = conn.execute(sa.text("SELECT DISTINCT location_id FROM games WHERE location_id IS NOT NULL")).scalars().all()
+    if used:
+        conn.execute(
+            sa.text("UPDATE games SET location_key = :value WHERE location_id = :id"),
+            [{"id": location_id, "value": path_key(location_id)} for location_id in used],
+        )
+
+    # One (sort expression, id) index per sort option so keyset pages stay index walks
+    op.create_index("ix_games_created_at_id", "games", ["created_at", "id"])
+    op.create_index("ix_games_release_year_id", "games", [sa.text("coalesce(release_date, 0)"), "id"])
+    op.create_index("ix_games_rating_id", "games", [sa.text("coalesce(rating, -1)"), "id"])
+    op.create_index("ix_games_location_key_id", "games", ["location_key", "id"])
+    op.create_index("ix_games_platform_count_id", "games", [sa.text("cardinality(platform_ids)"), "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_platform_count_id", table_name="games")
+    op.drop_index("ix_games_location_key_id", table_name="games")
+    op.drop_index("ix_games_rating_id", table_name="games")
+    op.drop_index("ix_games_release_year_id", table_name="games")
+    op.drop_index("ix_games_created_at_id", table_name="games")
+    op.drop_column("games", "location_key")
+    op.drop_column("games", "created_at")
@@ -0,0 +1,49 @@
+"""add location_closure ancestor/descendant table
+
+Revision ID: c4e9a7b3d1f6
+Revises: b8d2f5a1c9e3
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c4e9a7b3d1f6"
+down_revision = "b8d2f5a1c9e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "location_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_location_closure_descendant_depth", "location_closure", ["descendant_id", "depth"], unique=False
+    )
+
+    # Depth cap guards against a parent_id cycle in existing data
+    op.execute(
+        """
+        INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM locations
+            UNION ALL
+            SELECT tree.ancestor_id, l.id, tree.depth + 1
+            FROM locations l JOIN tree ON l.parent_id = tree.descendant_id
+            WHERE tree.depth < 64
+        )
+        SELECT DISTINCT ON (ancestor_id, descendant_id) ancestor_id, descendant_id, depth
+        FROM tree ORDER BY ancestor_id, descendant_id, depth
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_location_closure_descendant_depth", table_name="location_closure")
+    op.drop_table("location_closure")
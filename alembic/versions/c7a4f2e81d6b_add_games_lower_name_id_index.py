@@ -0,0 +1,21 @@
+"""add (lower(name), id) index on games for keyset pagination
+
+Revision ID: c7a4f2e81d6b
+Revises: 9c1e7d3a5b24
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c7a4f2e81d6b"
+down_revision = "9c1e7d3a5b24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_games_lower_name_id", "games", [sa.text("lower(name)"), "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_lower_name_id", table_name="games")
@@ -0,0 +1,35 @@
+"""add saved_searches with materialized game id sets
+
+Revision ID: d3f8a1b6c2e4
+Revises: c7a4f2e81d6b
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "d3f8a1b6c2e4"
+down_revision = "c7a4f2e81d6b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_searches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("params", postgresql.JSONB(), nullable=False),
+        sa.Column("game_ids", postgresql.ARRAY(sa.Integer()), nullable=False, server_default="{}"),
+        sa.Column("built_version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dirty_version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index(op.f("ix_saved_searches_id"), "saved_searches", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_saved_searches_id"), table_name="saved_searches")
+    op.drop_table("saved_searches")
@@ -0,0 +1,64 @@
+"""add accent/punctuation-folded name_normalized to games, companies, collections, tags
+
+Revision ID: e5b2c7d9a413
+Revises: d3f8a1b6c2e4
+Create Date: 2026-10-16 00:00:00
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from unidecode import unidecode
+
+revision = "e5b2c7d9a413"
+down_revision = "d3f8a1b6c2e4"
+branch_labels = None
+depends_on = None
+
+TABLES = ("games", "companies", "collections", "tags")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text):
+    # Frozen copy of utils.search_index.normalize_name
+    folded = unidecode(text or "").lower().replace("'", "")
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column("name_normalized", sa.String(), nullable=True))
+
+        rows = conn.execute(sa.text(f"SELECT id, name FROM {table}")).all()
+        if rows:
+            conn.execute(
+                sa.text(f"UPDATE {table} SET name_normalized = :value WHERE id = :id"),
+                [{"id": row_id, "value": _normalize(name)} for row_id, name in rows],
+            )
+
+        # Substring ('contains') and fuzzy ('%') matching on the folded name
+        op.create_index(
+            f"ix_{table}_name_normalized_trgm",
+            table,
+            ["name_normalized"],
+            postgresql_using="gin",
+            postgresql_ops={"name_normalized": "gin_trgm_ops"},
+        )
+
+    # Name search no longer reads the raw column
+    op.drop_index("ix_games_name_trgm", table_name="games")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_games_name_trgm",
+        "games",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_name_normalized_trgm", table_name=table)
+        op.drop_column(table, "name_normalized")
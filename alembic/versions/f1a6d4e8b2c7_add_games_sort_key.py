@@ -0,0 +1,49 @@
+"""add natural sort key to games
+
+Revision ID: f1a6d4e8b2c7
+Revises: e5b2c7d9a413
+Create Date: 2026-10-16 00:00:00
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from unidecode import unidecode
+
+revision = "f1a6d4e8b2c7"
+down_revision = "e5b2c7d9a413"
+branch_labels = None
+depends_on = None
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_LEADING_ARTICLE = re.compile(r"^(the|a|an) (?=.)")
+_DIGITS = re.compile(r"\d+")
+
+
+def _sort_key(text):
+    # Frozen copy of utils.search_index.game_sort_key
+    folded = unidecode(text or "").lower().replace("'", "")
+    key = _LEADING_ARTICLE.sub("", " ".join(_NON_ALNUM.sub(" ", folded).split()))
+    return _DIGITS.sub(lambda m: m.group().zfill(10), key)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    op.add_column("games", sa.Column("sort_key", sa.String(), nullable=False, server_default=""))
+
+    rows = conn.execute(sa.text("SELECT id, name FROM games")).all()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE games SET sort_key = :value WHERE id = :id"),
+            [{"id": row_id, "value": _sort_key(name)} for row_id, name in rows],
+        )
+
+    # Keyset pages and sorted listings walk this index instead of sorting lower(name)
+    op.create_index("ix_games_sort_key_id", "games", ["sort_key", "id"])
+    op.drop_index("ix_games_lower_name_id", table_name="games")
+
+
+def downgrade() -> None:
+    op.create_index("ix_games_lower_name_id", "games", [sa.text("lower(name)"), "id"])
+    op.drop_index("ix_games_sort_key_id", table_name="games")
+    op.drop_column("games", "sort_key")
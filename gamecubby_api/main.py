@@ -45,6 +45,7 @@ from .routers.genres import router as genres_router
 from .routers.playerperspectives import router as perspectives_router
 from .routers.company import router as company_router
 from .routers.search import router as search_router
+from .routers.saved_searches import router as saved_searches_router
 from .routers.auth import router as auth_router
 from .routers.app_config import router as appconfig_router
 from .routers.setup import router as setup_router
@@ -124,8 +125,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
                 pass
 
             try:
-                fpath = save_backup_to_disk()
-                prune_old_backups(retention_days)
+                # pg_dump + file pruning are blocking; keep them off the event loop
+                fpath = await asyncio.to_thread(save_backup_to_disk)
+                await asyncio.to_thread(prune_old_backups, retention_days)
                 print(f"[autobackup] backup saved: {fpath}")
             except Exception as e:
                 print(f"[autobackup] backup failed: {e}")
@@ -179,6 +181,7 @@ app.include_router(perspectives_router)
 app.include_router(locations_router)
 app.include_router(company_router)
 app.include_router(search_router)
+app.include_router(saved_searches_router)
 app.include_router(storage_router)
 app.include_router(sync_storage_router)
 app.include_router(downloads_router)
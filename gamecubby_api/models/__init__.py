@@ -20,4 +20,6 @@ from .game_mode import game_modes
 from .game_genre import game_genres
 from .game_playerperspective import game_playerperspectives
 from .igdb_tag import IGDBTag, game_igdb_tags
-from .app_config import AppConfig
\ No newline at end of file
+from .app_config import AppConfig
+from .saved_search import SavedSearch, saved_search_changes
+from .location_closure import location_closure
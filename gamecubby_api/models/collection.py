@@ -8,6 +8,7 @@ class Collection(Base):
     id = Column(Integer, primary_key=True)
     igdb_id = Column(Integer, unique=True, nullable=True)  # can be null for manual
     name = Column(String, unique=True, nullable=False)
+    name_normalized = Column(String, nullable=True)  # maintained by utils.search_index
 
     def __repr__(self):
         return f"<Collection(id={self.id}, name={self.name}, igdb_id={self.igdb_id})>"
@@ -7,6 +7,7 @@ class Company(Base):
 
     id = Column(Integer, primary_key=True)  # IGDB company ID
     name = Column(String, nullable=False)
+    name_normalized = Column(String, nullable=True)  # maintained by utils.search_index
 
     def __repr__(self):
         return f"<Company(id={self.id}, name={self.name})>"
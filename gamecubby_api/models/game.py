@@ -1,5 +1,8 @@
+import time
+
 from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR, ARRAY
+from sqlalchemy.orm import relationship, deferred
 
 from ..models.game_platform import game_platforms
 from ..models.game_tag import game_tags
@@ -20,6 +23,8 @@ class Game(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     igdb_id = Column(Integer, nullable=True, index=True)
     name = Column(String, nullable=False)
+    name_normalized = Column(String, nullable=True)  # maintained by utils.search_index
+    sort_key = Column(String, nullable=False, default="")  # maintained by utils.search_index
     summary = Column(String, nullable=True)
     release_date = Column(Integer, nullable=True)
     cover_url = Column(String, nullable=True)
@@ -28,6 +33,18 @@ class Game(Base):
     order = Column(Integer, nullable=True)
     rating = Column(Integer, nullable=True)
     updated_at = Column(Integer, nullable=True)
+    created_at = Column(Integer, nullable=False, default=lambda: int(time.time()))  # 0 = added before tracking
+    location_key = Column(String, nullable=False, default="")  # maintained by utils.search_index
+    search_vector = deferred(Column(TSVECTOR, nullable=True))  # maintained by utils.search_index
+
+    # Sorted IDs of each facet association, GIN-indexed for search; maintained by utils.search_index
+    platform_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    tag_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    genre_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    mode_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    perspective_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    company_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
+    igdb_tag_ids = deferred(Column(ARRAY(Integer), nullable=False, server_default="{}"))
 
     location = relationship("Location")
 
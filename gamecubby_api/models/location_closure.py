@@ -0,0 +1,13 @@
+from sqlalchemy import Table, Column, Integer, ForeignKey, Index
+from ..models import Base
+
+# Every (ancestor, descendant) pair of the locations tree, including each location
+# paired with itself at depth 0. Maintained by utils.location on every tree write.
+location_closure = Table(
+    "location_closure",
+    Base.metadata,
+    Column("ancestor_id", Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True),
+    Column("depth", Integer, nullable=False),
+    Index("ix_location_closure_descendant_depth", "descendant_id", "depth"),
+)
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, Index, Integer, String, Table, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from ..models import Base
+
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    params = Column(JSONB, nullable=False)  # [[key, value], ...] as passed to /search/advanced
+    game_ids = Column(ARRAY(Integer), nullable=False, default=list)  # materialized matches, ascending
+    # Transaction ID up to which saved_search_changes are reflected in game_ids; see utils.saved_search
+    changes_seen = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<SavedSearch(id={self.id}, name={self.name})>"
+
+
+# Append-only log of search-relevant writes: one row per changed game (NULL = any game),
+# stamped with the writing transaction's ID. Saved searches apply it when next viewed.
+saved_search_changes = Table(
+    "saved_search_changes",
+    Base.metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("game_id", Integer, nullable=True),
+    Column("xid", BigInteger, nullable=False, server_default=text("txid_current()")),
+    Index("ix_saved_search_changes_xid", "xid"),
+)
@@ -8,6 +8,7 @@ class Tag(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
+    name_normalized = Column(String, nullable=True)  # maintained by utils.search_index
 
     games = relationship("Game", secondary="game_tags", back_populates="tags")
 
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/backup", tags=["Backup"])
 
 
 @router.get("/", response_class=StreamingResponse, dependencies=[Depends(get_current_admin)])
-async def backup_database():
+def backup_database():
     """
     One-off backup download (unchanged).
     Streams a temporary pg_dump file back to the client.
@@ -41,7 +41,7 @@ def _env_int(name: str, default: int) -> int:
 
 
 @router.post("/save", dependencies=[Depends(get_current_admin)])
-async def backup_save_to_disk():
+def backup_save_to_disk():
     """
     Admin-only endpoint intended for periodic schedulers (e.g. cron/healthcheck).
     Behavior:
@@ -5,6 +5,7 @@ from ..schemas.collection import Collection as CollectionSchema
 from ..utils.collection import get_collection, list_collections
 from ..utils.auth import get_current_admin
 from ..utils.external import fetch_igdb_collection
+from ..utils.db_tools import run_blocking
 
 router = APIRouter(prefix="/collections", tags=["Collections"])
 
@@ -23,6 +24,6 @@ def get_collection_by_id(collection_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/collection_lookup/{game_id}", dependencies=[Depends(get_current_admin)])
-async def collection_lookup(game_id: int):
-    result = await fetch_igdb_collection(game_id)
+def collection_lookup(game_id: int):
+    result = run_blocking(fetch_igdb_collection(game_id))
     return {"collection": result}
@@ -5,13 +5,14 @@ from sqlalchemy.orm import Session
 from ..db import get_db
 from ..models.company import Company
 from ..utils.game_company import sync_companies
+from ..utils.db_tools import run_blocking
 
 router = APIRouter(prefix="/company", tags=["Company"])
 
 
 @router.post("/sync")
-async def sync_companies_endpoint():
-    await sync_companies()
+def sync_companies_endpoint():
+    run_blocking(sync_companies())
     return JSONResponse(content={"message": "Company sync completed"})
 
 
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..db import get_db
 from ..schemas.game import (
     Game as GameSchema,
@@ -18,6 +18,9 @@ from ..utils.game import (
     refresh_game_metadata,
     refresh_all_games_metadata,
     force_refresh_metadata, list_games_preview,
+    games_preview_etag,
+    GAME_PROJECTIONS,
+    validate_projection,
 )
 from ..utils.game_tag import attach_tag, detach_tag, list_tags_for_game
 from ..utils.game_platform import attach_platform, detach_platform, list_platforms_for_game
@@ -25,21 +28,45 @@ from ..schemas.tag import Tag as TagSchema
 from ..schemas.platform import Platform as PlatformSchema
 from ..utils.location import get_location_path
 from ..utils.auth import get_current_admin
+from ..utils.db_tools import run_blocking
+from ..utils.etag import etag_matches
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
 
 @router.get("/", response_model=List[GamePreview])
-def get_all_games(db: Session = Depends(get_db)):
-    return list_games_preview(db)
-
-
-@router.get("/{game_id}", response_model=GameSchema)
-def get_game_by_id(game_id: int, db: Session = Depends(get_db)):
-    game = get_game(db, game_id)
+def get_all_games(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; omit to list every game"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header value of the previous page"),
+    db: Session = Depends(get_db),
+):
+    if_none_match = request.headers.get("if-none-match")
+    etag = games_preview_etag(db, limit, cursor, fresh=if_none_match is not None)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    games, next_cursor = list_games_preview(db, limit, cursor)
+    response.headers["ETag"] = etag
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return games
+
+
+# The projection picks the schema, so serialize exactly the model built below rather
+# than letting a response_model union choose one.
+@router.get("/{game_id}", response_model=None)
+def get_game_by_id(
+    game_id: int,
+    fields: Optional[str] = Query(None, description="Projection: 'card', 'list' or 'full' (default)"),
+    db: Session = Depends(get_db),
+):
+    projection = validate_projection(fields)
+    game = get_game(db, game_id, projection)
     if not game:
         raise HTTPException(404, "Game not found")
-    return game
+    return GAME_PROJECTIONS[projection][0].model_validate(game)
 
 
 @router.put("/{game_id}", response_model=GameSchema, dependencies=[Depends(get_current_admin)])
@@ -62,8 +89,8 @@ def remove_game(game_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/from_igdb", response_model=GameSchema, dependencies=[Depends(get_current_admin)])
-async def add_game_from_igdb_endpoint(req: AddGameFromIGDBRequest, db: Session = Depends(get_db)):
-    game = await add_game_from_igdb(
+def add_game_from_igdb_endpoint(req: AddGameFromIGDBRequest, db: Session = Depends(get_db)):
+    game = run_blocking(add_game_from_igdb(
         db,
         igdb_id=req.igdb_id,
         platform_ids=req.platform_ids,
@@ -71,7 +98,7 @@ async def add_game_from_igdb_endpoint(req: AddGameFromIGDBRequest, db: Session =
         tag_ids=req.tag_ids,
         condition=req.condition,
         order=req.order,
-    )
+    ))
     if not game:
         raise HTTPException(404, "Game not found on IGDB")
     return game
@@ -91,8 +118,8 @@ def add_game(game: GameCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/{game_id}/refresh_metadata", dependencies=[Depends(get_current_admin)])
-async def refresh_metadata_endpoint(game_id: int, db: Session = Depends(get_db)):
-    game, updated, msg = await refresh_game_metadata(db, game_id)
+def refresh_metadata_endpoint(game_id: int, db: Session = Depends(get_db)):
+    game, updated, msg = run_blocking(refresh_game_metadata(db, game_id))
     if not game:
         raise HTTPException(404, msg)
     return {
@@ -103,7 +130,7 @@ async def refresh_metadata_endpoint(game_id: int, db: Session = Depends(get_db))
 
 
 @router.post("/refresh_all_metadata", dependencies=[Depends(get_current_admin)])
-async def refresh_all_metadata_endpoint(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+def refresh_all_metadata_endpoint(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     def do_refresh():
         refresh_all_games_metadata(db)
 
@@ -112,7 +139,7 @@ async def refresh_all_metadata_endpoint(background_tasks: BackgroundTasks, db: S
 
 
 @router.post("/force_refresh_metadata", dependencies=[Depends(get_current_admin)])
-async def force_refresh_metadata_endpoint(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+def force_refresh_metadata_endpoint(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     def do_force_refresh():
         force_refresh_metadata(db)
 
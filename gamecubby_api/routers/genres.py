@@ -4,6 +4,7 @@ from typing import List
 
 from ..db import get_db
 from ..utils.genre import sync_genres
+from ..utils.db_tools import run_blocking
 from ..models.genre import Genre
 from ..utils.auth import get_current_admin
 
@@ -11,9 +12,9 @@ router = APIRouter(prefix="/genres", tags=["Genres"])
 
 
 @router.post("/sync", dependencies=[Depends(get_current_admin)])
-async def sync_genres_endpoint(db: Session = Depends(get_db)):
+def sync_genres_endpoint(db: Session = Depends(get_db)):
     try:
-        genres = await sync_genres(db)
+        genres = run_blocking(sync_genres(db))
         return {"message": "Genres synced successfully.", "count": len(genres)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -12,6 +12,7 @@ from ..utils.app_config import get_int_config_value, get_or_create_query_limit
 from fastapi import APIRouter, Depends, HTTPException, Query
 from ..utils.auth import get_current_admin
 from ..db import get_db
+from ..utils.db_tools import run_blocking
 from ..models.igdb_tag import IGDBTag  # ← added
 
 router = APIRouter(tags=["IGDB"])
@@ -21,11 +22,11 @@ IGDB_URL = "https://api.igdb.com/v4/games"
 
 
 @router.get("/search", response_model=list[GamePreview])
-async def igdb_game_search(q: str, db: Session = Depends(get_db)):
+def igdb_game_search(q: str, db: Session = Depends(get_db)):
     if not q or len(q.strip()) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
 
-    games_raw = await search_igdb_games(q)
+    games_raw = run_blocking(search_igdb_games(q))
     if not games_raw:
         return []
 
@@ -43,28 +44,28 @@ async def igdb_game_search(q: str, db: Session = Depends(get_db)):
 
 
 @router.get("/game/{igdb_id}", dependencies=[Depends(get_current_admin)])
-async def get_igdb_game_by_id(igdb_id: int, db: Session = Depends(get_db)):
-    raw = await fetch_igdb_game(igdb_id)
+def get_igdb_game_by_id(igdb_id: int, db: Session = Depends(get_db)):
+    raw = run_blocking(fetch_igdb_game(igdb_id))
     if not raw:
         raise HTTPException(status_code=404, detail="Game not found on IGDB")
 
     game = format_igdb_game(raw, db)
 
-    collections = await fetch_igdb_collection(igdb_id)
+    collections = run_blocking(fetch_igdb_collection(igdb_id))
     game["collection"] = collections[0] if collections else None
 
     if game.get("platforms"):
         ensure_platforms_exist(db, game["platforms"])
 
     if raw.get("tags"):
-        tags = await upsert_igdb_tags(db, raw["tags"])
+        tags = run_blocking(upsert_igdb_tags(db, raw["tags"]))
         db.commit()
         game["igdb_tags"] = [{"id": t.id, "name": t.name} for t in tags]
     else:
         game["igdb_tags"] = []
 
     if raw.get("involved_companies"):
-        companies = await fetch_igdb_involved_companies(raw["involved_companies"])
+        companies = run_blocking(fetch_igdb_involved_companies(raw["involved_companies"]))
         game["companies"] = companies
 
         from gamecubby_api.utils.game_company import upsert_companies
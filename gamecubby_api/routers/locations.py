@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, Body
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Body
 from sqlalchemy.orm import Session
 from ..db import get_db
 from ..schemas.game import GameIdName
-from ..schemas.location import Location as LocationSchema, LocationMigrationResult, LocationMigrationRequest
+from ..schemas.location import (
+    Location as LocationSchema, LocationMigrationResult, LocationMigrationRequest, LocationTreeNode,
+)
 from ..utils.game import list_games_by_location
 from ..utils.location import (
     create_location,
@@ -11,7 +15,12 @@ from ..utils.location import (
     list_child_locations,
     list_all_locations,
     delete_location, rename_location, migrate_location_games,
+    reparent_location,
+    get_location_tree,
 )
+from ..utils.location_cache import get_location_version
+from ..utils.search_index import get_search_generation
+from ..utils.etag import etag_matches
 from ..utils.auth import get_current_admin
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
@@ -38,6 +47,22 @@ def get_children(parent_id: int, db: Session = Depends(get_db)):
     return list_child_locations(db, parent_id)
 
 
+@router.get("/tree", response_model=list[LocationTreeNode])
+def get_tree(request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Whole storage hierarchy with direct and subtree game counts per node. The ETag pairs
+    the location version (names and structure) with the search generation, which every
+    game create, delete or move bumps (counts); both are read fresh for If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    fresh = if_none_match is not None
+    etag = f'W/"locations-{get_location_version(db, fresh)}-{get_search_generation(db, fresh)}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return get_location_tree(db)
+
+
 @router.get("/", response_model=list[LocationSchema])
 def get_all_locations(db: Session = Depends(get_db)):
     return list_all_locations(db)
@@ -86,6 +111,24 @@ def rename_location_endpoint(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.put("/{location_id}/parent", response_model=LocationSchema, dependencies=[Depends(get_current_admin)])
+def reparent_location_endpoint(
+        location_id: int,
+        parent_id: Optional[int] = Body(None, embed=True),
+        db: Session = Depends(get_db),
+):
+    """
+    Move a location (and everything beneath it) under parent_id; null makes it a root.
+    """
+    try:
+        updated = reparent_location(db, location_id, parent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return updated
+
+
 @router.post(
     "/migrate",
     response_model=LocationMigrationResult,
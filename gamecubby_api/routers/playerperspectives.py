@@ -4,14 +4,15 @@ from ..db import get_db
 from ..utils.playerperspective import sync_player_perspectives, get_player_perspective_by_id
 from ..models.playerperspective import PlayerPerspective
 from ..utils.auth import get_current_admin
+from ..utils.db_tools import run_blocking
 
 router = APIRouter(prefix="/perspectives", tags=["Player Perspectives"])
 
 
 @router.post("/sync", dependencies=[Depends(get_current_admin)])
-async def sync_perspectives(db: Session = Depends(get_db)):
+def sync_perspectives(db: Session = Depends(get_db)):
     try:
-        count = await sync_player_perspectives(db)
+        count = run_blocking(sync_player_perspectives(db))
         return {"message": "Player perspectives synced successfully.", "synced": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
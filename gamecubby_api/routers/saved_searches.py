@@ -0,0 +1,53 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..schemas.saved_search import SavedSearch as SavedSearchSchema, SavedSearchCreate
+from ..utils.auth import get_current_admin
+from ..utils.saved_search import (
+    create_saved_search,
+    get_saved_search,
+    list_saved_searches,
+    delete_saved_search,
+    describe_saved_search,
+    get_saved_search_results,
+)
+
+router = APIRouter(prefix="/search/saved", tags=["Saved Searches"])
+
+
+@router.post("/", response_model=SavedSearchSchema, dependencies=[Depends(get_current_admin)])
+def create_saved_search_endpoint(payload: SavedSearchCreate, db: Session = Depends(get_db)):
+    return describe_saved_search(db, create_saved_search(db, payload.name, payload.params))
+
+
+@router.get("/", response_model=list[SavedSearchSchema])
+def list_saved_searches_endpoint(db: Session = Depends(get_db)):
+    return [describe_saved_search(db, s) for s in list_saved_searches(db)]
+
+
+@router.get("/{saved_id}", response_model=SavedSearchSchema)
+def get_saved_search_endpoint(saved_id: int, db: Session = Depends(get_db)):
+    return describe_saved_search(db, get_saved_search(db, saved_id))
+
+
+@router.get("/{saved_id}/results")
+def saved_search_results(
+    saved_id: int,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor: pass next_cursor from the previous page"),
+    count: Optional[str] = Query(None, description="'has_more' or 'total' page metadata"),
+    fields: Optional[str] = Query(None, description="Projection: 'card', 'list' or 'full' (default)"),
+    sort: Optional[str] = Query(None, description="name (default), year, rating, added, location or platforms; '-' prefix for descending"),
+    db: Session = Depends(get_db),
+):
+    return get_saved_search_results(db, saved_id, limit, offset, cursor, count, fields, sort)
+
+
+@router.delete("/{saved_id}", dependencies=[Depends(get_current_admin)])
+def delete_saved_search_endpoint(saved_id: int, db: Session = Depends(get_db)):
+    delete_saved_search(db, saved_id)
+    return {"message": "Saved search deleted successfully."}
@@ -4,15 +4,247 @@ from ..utils.search import (
     search_game_name_suggestions,
     search_tag_suggestions,
     search_games_advanced,
+    search_games_fulltext,
+    search_games_facets,
+    get_search_cache_stats,
     search_company_suggestions,
     search_collection_suggestions,
     search_mode_suggestions,
     search_igdb_tag_suggestions,
+    search_all_suggestions,
 )
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 
+# Page metadata shared by /search/basic and /search/advanced
+COUNT_PARAMETER = {
+    "name": "count",
+    "in": "query",
+    "required": False,
+    "schema": {"type": "string", "enum": ["total", "has_more"]},
+    "description": "'has_more' adds whether another page exists; 'total' also adds the size of the whole "
+                   "filtered result set, computed in the same query as the page",
+}
+
+
+# Result order shared by /search/basic and /search/advanced
+SORT_PARAMETER = {
+    "name": "sort",
+    "in": "query",
+    "required": False,
+    "schema": {
+        "type": "string",
+        "enum": [
+            "name", "-name", "year", "-year", "rating", "-rating",
+            "added", "-added", "location", "-location", "platforms", "-platforms",
+        ],
+    },
+    "description": "Order by name (default, natural order), release year, rating, recently added, "
+                   "location path or platform count; '-' prefix for descending. Ties break on id.",
+}
+
+
+# Response projection shared by every endpoint that returns games
+FIELDS_PARAMETER = {
+    "name": "fields",
+    "in": "query",
+    "required": False,
+    "schema": {"type": "string", "enum": ["card", "list", "full"]},
+    "description": "Projection: 'card' (id, name, cover, platforms), 'list' (table row without summary, "
+                   "companies, IGDB tags, modes, genres or perspectives) or 'full' (default)",
+}
+
+
+# Filter params shared by /search/advanced and /search/facets
+ADVANCED_FILTER_PARAMETERS = [
+    {
+        "name": "q",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string"},
+        "description": "Query expression, ANDed with the other params, e.g. "
+                       "'platform:snes genre:rpg year:1990..1995 tag:boxed -tag:loose loc:\"Attic\"'. "
+                       "Keys: platform, genre, mode, perspective, tag, igdb_tag, company (comma = any of), "
+                       "collection, loc (includes sub-locations), year (YYYY or YYYY..YYYY), name, "
+                       "manual (true/false/only). Prefix '-' to exclude; bare words match the name.",
+    },
+    {"name": "name", "in": "query", "required": False, "schema": {"type": "string"}},
+    {
+        "name": "name_match",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["contains", "fuzzy"]},
+        "description": "Name match mode: 'contains' (default, substring) or 'fuzzy' (typo-tolerant, ranked by similarity)",
+    },
+    {
+        "name": "fuzzy_threshold",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "number", "minimum": 0, "maximum": 1},
+        "description": "Minimum similarity (0..1) for name_match=fuzzy. Defaults to SEARCH_FUZZY_THRESHOLD (0.3).",
+    },
+    {"name": "year", "in": "query", "required": False, "schema": {"type": "integer"}},
+    {"name": "year_min", "in": "query", "required": False, "schema": {"type": "integer"}},
+    {"name": "year_max", "in": "query", "required": False, "schema": {"type": "integer"}},
+
+    # Platforms + match mode
+    {
+        "name": "platform_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more platform IDs",
+    },
+    {
+        "name": "platform_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for platform_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # User tags + match mode (keeps 'match_mode' for backward-compat)
+    {
+        "name": "tag_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more user tag IDs",
+    },
+    {
+        "name": "match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for tag_ids (user tags): 'any' (default), 'all', or 'exact'",
+    },
+
+    # Genres + match mode
+    {
+        "name": "genre_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more genre IDs",
+    },
+    {
+        "name": "genre_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for genre_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # Modes + match mode
+    {
+        "name": "mode_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more mode IDs",
+    },
+    {
+        "name": "mode_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for mode_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # Perspectives + match mode
+    {
+        "name": "perspective_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more player perspective IDs",
+    },
+    {
+        "name": "perspective_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for perspective_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # Collection
+    {"name": "collection_id", "in": "query", "required": False, "schema": {"type": "integer"}},
+
+    # Companies (single & multiple) + match mode
+    {
+        "name": "company_id",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "integer"},
+        "description": "Company ID (you can repeat 'company_id' to pass multiple)",
+    },
+    {
+        "name": "company_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more company IDs",
+    },
+    {
+        "name": "company_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for company_id/company_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # IGDB tags + match mode
+    {
+        "name": "igdb_tag_ids",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "array", "items": {"type": "integer"}},
+        "style": "form",
+        "explode": True,
+        "description": "One or more IGDB tag IDs",
+    },
+    {
+        "name": "igdb_match_mode",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["any", "all", "exact"]},
+        "description": "Match mode for igdb_tag_ids: 'any' (default), 'all', or 'exact'",
+    },
+
+    # Location
+    {"name": "location_id", "in": "query", "required": False, "schema": {"type": "integer"}},
+    {
+        "name": "include_location_descendants",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["true", "false"]},
+        "description": "If 'true', include games in all descendant locations of the given location_id. Default is 'false' (exact match only).",
+    },
+
+    # Manual entries toggles
+    {
+        "name": "include_manual",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "enum": ["true", "false", "only"]},
+        "description": "'true' = include manual entries, 'false' = exclude them, 'only' = only manual entries (igdb_id == 0).",
+    },
+]
+
+
 @router.get(
     "/basic",
     openapi_extra={
@@ -24,6 +256,20 @@ router = APIRouter(prefix="/search", tags=["Search"])
                 "schema": {"type": "string"},
                 "description": "Partial or full game name",
             },
+            {
+                "name": "name_match",
+                "in": "query",
+                "required": False,
+                "schema": {"type": "string", "enum": ["contains", "fuzzy"]},
+                "description": "Name match mode: 'contains' (default, substring) or 'fuzzy' (typo-tolerant, ranked by similarity)",
+            },
+            {
+                "name": "fuzzy_threshold",
+                "in": "query",
+                "required": False,
+                "schema": {"type": "number", "minimum": 0, "maximum": 1},
+                "description": "Minimum similarity (0..1) for name_match=fuzzy. Defaults to SEARCH_FUZZY_THRESHOLD (0.3).",
+            },
             {
                 "name": "year",
                 "in": "query",
@@ -68,187 +314,134 @@ router = APIRouter(prefix="/search", tags=["Search"])
                 "schema": {"type": "integer"},
                 "description": "How many results to skip (for pagination)",
             },
+            {
+                "name": "cursor",
+                "in": "query",
+                "required": False,
+                "schema": {"type": "string"},
+                "description": "Opaque keyset cursor: pass next_cursor from the previous page (use with limit, not offset)",
+            },
+            COUNT_PARAMETER,
+            SORT_PARAMETER,
+            FIELDS_PARAMETER,
         ]
     },
 )
-async def basic_search(request: Request):
-    results = search_games_basic(request)
-    return {"results": results}
+def basic_search(request: Request):
+    return search_games_basic(request)
 
 
 @router.get(
     "/advanced",
+    responses={
+        200: {
+            "content": {
+                "application/json": {},
+                "application/x-ndjson": {
+                    "description": "Sent for Accept: application/x-ndjson; one game per line, streamed",
+                },
+            }
+        }
+    },
     openapi_extra={
-        "parameters": [
-            {"name": "name", "in": "query", "required": False, "schema": {"type": "string"}},
-            {"name": "year", "in": "query", "required": False, "schema": {"type": "integer"}},
-            {"name": "year_min", "in": "query", "required": False, "schema": {"type": "integer"}},
-            {"name": "year_max", "in": "query", "required": False, "schema": {"type": "integer"}},
-
-            # Platforms + match mode
-            {
-                "name": "platform_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more platform IDs",
-            },
+        "parameters": ADVANCED_FILTER_PARAMETERS + [
+            # Pagination
+            {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer"}},
+            {"name": "offset", "in": "query", "required": False, "schema": {"type": "integer"}},
             {
-                "name": "platform_match_mode",
+                "name": "cursor",
                 "in": "query",
                 "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for platform_ids: 'any' (default), 'all', or 'exact'",
+                "schema": {"type": "string"},
+                "description": "Opaque keyset cursor: pass next_cursor from the previous page (use with limit, not offset)",
             },
+            COUNT_PARAMETER,
+            SORT_PARAMETER,
+            FIELDS_PARAMETER,
+        ]
+    },
+)
+def advanced_search(request: Request):
+    return search_games_advanced(request)
 
-            # User tags + match mode (keeps 'match_mode' for backward-compat)
-            {
-                "name": "tag_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more user tag IDs",
-            },
-            {
-                "name": "match_mode",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for tag_ids (user tags): 'any' (default), 'all', or 'exact'",
-            },
 
-            # Genres + match mode
-            {
-                "name": "genre_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more genre IDs",
-            },
+@router.get(
+    "/fulltext",
+    openapi_extra={
+        "parameters": [
             {
-                "name": "genre_match_mode",
+                "name": "q",
                 "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for genre_ids: 'any' (default), 'all', or 'exact'",
+                "required": True,
+                "schema": {"type": "string"},
+                "description": "Words to find in game name, summary, collection or company names. "
+                               "Supports quoted phrases, OR and -exclusions.",
             },
+            {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer"}},
+            {"name": "offset", "in": "query", "required": False, "schema": {"type": "integer"}},
+            FIELDS_PARAMETER,
+        ]
+    },
+)
+def fulltext_search(request: Request):
+    results = search_games_fulltext(request)
+    return {"results": results}
 
-            # Modes + match mode
-            {
-                "name": "mode_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more mode IDs",
-            },
-            {
-                "name": "mode_match_mode",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for mode_ids: 'any' (default), 'all', or 'exact'",
-            },
 
-            # Perspectives + match mode
-            {
-                "name": "perspective_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more player perspective IDs",
-            },
-            {
-                "name": "perspective_match_mode",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for perspective_ids: 'any' (default), 'all', or 'exact'",
-            },
+@router.get(
+    "/facets",
+    openapi_extra={"parameters": ADVANCED_FILTER_PARAMETERS},
+)
+def facet_counts(request: Request):
+    return search_games_facets(request)
 
-            # Collection
-            {"name": "collection_id", "in": "query", "required": False, "schema": {"type": "integer"}},
 
-            # Companies (single & multiple) + match mode
-            {
-                "name": "company_id",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "integer"},
-                "description": "Company ID (you can repeat 'company_id' to pass multiple)",
-            },
-            {
-                "name": "company_ids",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
-                "style": "form",
-                "explode": True,
-                "description": "One or more company IDs",
-            },
+@router.get("/cache/stats")
+def search_cache_stats():
+    """
+    Hit/miss/eviction counters and current size of this worker's search result cache.
+    """
+    return get_search_cache_stats()
+
+
+@router.get(
+    "/suggest",
+    openapi_extra={
+        "parameters": [
             {
-                "name": "company_match_mode",
+                "name": "q",
                 "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for company_id/company_ids: 'any' (default), 'all', or 'exact'",
+                "required": True,
+                "schema": {"type": "string"},
+                "description": "Partial text to autocomplete across games, tags, IGDB tags, genres, modes, collections and companies",
             },
-
-            # IGDB tags + match mode
             {
-                "name": "igdb_tag_ids",
+                "name": "types",
                 "in": "query",
                 "required": False,
-                "schema": {"type": "array", "items": {"type": "integer"}},
+                "schema": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["names", "tags", "igdb_tags", "genres", "modes", "collections", "companies"],
+                    },
+                },
                 "style": "form",
                 "explode": True,
-                "description": "One or more IGDB tag IDs",
-            },
-            {
-                "name": "igdb_match_mode",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["any", "all", "exact"]},
-                "description": "Match mode for igdb_tag_ids: 'any' (default), 'all', or 'exact'",
-            },
-
-            # Location
-            {"name": "location_id", "in": "query", "required": False, "schema": {"type": "integer"}},
-            {
-                "name": "include_location_descendants",
-                "in": "query",
-                "required": False,
-                "schema": {"type": "string", "enum": ["true", "false"]},
-                "description": "If 'true', include games in all descendant locations of the given location_id. Default is 'false' (exact match only).",
+                "description": "Only return these groups (default: all)",
             },
-
-            # Manual entries toggles
             {
-                "name": "include_manual",
+                "name": "limit",
                 "in": "query",
                 "required": False,
-                "schema": {"type": "string", "enum": ["true", "false", "only"]},
-                "description": "'true' = include manual entries, 'false' = exclude them, 'only' = only manual entries (igdb_id == 0).",
+                "schema": {"type": "integer", "minimum": 1, "maximum": 50},
+                "description": "Max suggestions per group (default 10)",
             },
-
-            # Pagination
-            {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer"}},
-            {"name": "offset", "in": "query", "required": False, "schema": {"type": "integer"}},
         ]
     },
 )
-def advanced_search(request: Request):
-    results = search_games_advanced(request)
-    return {"results": results}
+def suggest_all(request: Request):
+    return {"suggestions": search_all_suggestions(request)}
 
 
 @router.get(
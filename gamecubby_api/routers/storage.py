@@ -43,7 +43,7 @@ def list_files(
 
 
 @router.post('/upload', response_model=dict)
-async def upload_file(
+def upload_file(
         game_id: int,
         label: str = Form(...),
         category: FileCategory = Form(...),  # required content category
@@ -61,7 +61,7 @@ async def upload_file(
     safe_name = sanitize_filename(file.filename)
 
     try:
-        file_record = await upload_and_register_file(
+        file_record = upload_and_register_file(
             db=db,
             game=game,
             upload_file=file,
@@ -84,12 +84,12 @@ async def upload_file(
 
 
 @router.delete("/{file_id}", status_code=204)
-async def delete_file(
+def delete_file(
     file_id: int,
     db: Session = Depends(get_db),
     admin=Depends(get_current_admin),
 ) -> None:
-    await delete_game_file(db, file_id)
+    delete_game_file(db, file_id)
 
 
 @router.post("/sync-files", response_model=dict)
@@ -140,7 +140,7 @@ def list_file_categories() -> List[str]:
 
 
 @downloads_router.get("/{file_id}")
-async def download_file(
+def download_file(
     file_id: int,
     db: Session = Depends(get_db),
     admin = Depends(get_current_admin_optional),
@@ -166,7 +166,7 @@ class LabelUpdate(BaseModel):
 
 
 @router.patch("/{file_id}/label", response_model=FileResponse)
-async def patch_file_label(
+def patch_file_label(
     game_id: int,
     file_id: int,
     payload: LabelUpdate,
@@ -188,7 +188,7 @@ async def patch_file_label(
     game_ref = str(game.igdb_id) if game.igdb_id else "".join(c for c in game.name.lower() if c.isalnum())
 
     try:
-        updated = await update_file_label(db, file_id, game_ref, payload.label)
+        updated = update_file_label(db, file_id, game_ref, payload.label)
         return updated
     except HTTPException:
         raise
@@ -59,6 +59,41 @@ class Game(BaseModel):
         from_attributes = True
 
 
+class GameCard(BaseModel):
+    """
+    fields=card: just enough for a grid tile.
+    """
+    id: int
+    name: str
+    cover_url: Optional[str] = None
+    platforms: List[Platform] = Field(default_factory=list)
+
+    class Config:
+        from_attributes = True
+
+
+class GameListItem(BaseModel):
+    """
+    fields=list: one table row, without summary, companies, IGDB tags, modes, genres or perspectives.
+    """
+    id: int
+    igdb_id: int
+    name: str
+    release_date: Optional[int] = None
+    cover_url: Optional[str] = None
+    condition: Optional[int] = None
+    location_path: List[LocationPathItem] = Field(default_factory=list)
+    order: Optional[int] = None
+    rating: Optional[int] = None
+    updated_at: Optional[int] = None
+    platforms: List[Platform] = Field(default_factory=list)
+    tags: List[Tag] = Field(default_factory=list)
+    collection: Optional[Collection] = None
+
+    class Config:
+        from_attributes = True
+
+
 class GameCreate(BaseModel):
     name: str
     summary: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Location(BaseModel):
@@ -24,3 +24,13 @@ class LocationMigrationResult(BaseModel):
     Response model for a migration operation.
     """
     migrated: int
+
+
+class LocationTreeNode(Location):
+    """
+    One node of GET /locations/tree: games stored directly here, games anywhere in
+    this subtree, and the child nodes (sorted by name).
+    """
+    game_count: int = 0
+    subtree_game_count: int = 0
+    children: list["LocationTreeNode"] = Field(default_factory=list)
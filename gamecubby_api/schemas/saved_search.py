@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+
+
+class SavedSearchCreate(BaseModel):
+    """
+    A named /search/advanced parameter set, e.g.
+    {"name": "PAL RPGs in the attic", "params": {"genre_ids": [12], "platform_ids": [19, 58], "location_id": 3}}
+    """
+    name: str
+    params: Dict[str, Union[str, int, List[Union[str, int]]]] = Field(default_factory=dict)
+
+
+class SavedSearch(BaseModel):
+    id: int
+    name: str
+    params: Dict[str, List[str]]
+    total: int
+    stale: bool
+    refreshed_at: Optional[int] = None
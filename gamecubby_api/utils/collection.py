@@ -1,11 +1,13 @@
 from sqlalchemy.orm import Session
 from ..models.collection import Collection
 from typing import Optional
+from .search_index import bump_search_generation
 
 
 def create_collection(session: Session, collection_data: dict) -> Collection:
     collection = Collection(**collection_data)
     session.add(collection)
+    bump_search_generation(session, [])
     session.commit()
     session.refresh(collection)
     return collection
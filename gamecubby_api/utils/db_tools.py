@@ -1,7 +1,11 @@
+import asyncio
 from contextlib import contextmanager
+from typing import Awaitable, TypeVar
 from ..db import get_db
 from sqlalchemy.orm import Session
 
+T = TypeVar("T")
+
 
 @contextmanager
 def with_db() -> Session:
@@ -19,3 +23,18 @@ def with_db() -> Session:
         yield db
     finally:
         db_gen.close()
+
+
+def run_blocking(coro: Awaitable[T]) -> T:
+    """
+    Run an IGDB coroutine to completion on a private event loop in the current thread.
+
+    The IGDB helpers await HTTP calls but do their DB work with the regular (blocking)
+    Session, so they must never run on the server's event loop. Route handlers stay
+    plain `def` (FastAPI runs them in its threadpool) and call this instead:
+
+        @router.post("/sync")
+        def sync_genres_endpoint(db: Session = Depends(get_db)):
+            genres = run_blocking(sync_genres(db))
+    """
+    return asyncio.run(coro)
@@ -0,0 +1,21 @@
+from typing import Optional
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of `etag` against an If-None-Match header value: a comma-separated
+    list of (possibly weak) entity tags, or '*' for any current representation.
+    """
+    if not if_none_match:
+        return False
+    wanted = _opaque(etag)
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag and _opaque(tag) == wanted):
+            return True
+    return False
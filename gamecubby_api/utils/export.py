@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from ..models.game import Game as GameModel
 from ..schemas.game import Game
+from .game import GAME_SCHEMA_LOADERS
+from .location import attach_location_paths
 import csv
 import io
 import json
@@ -9,7 +11,13 @@ from fastapi.responses import StreamingResponse
 
 
 def export_games_as_dicts(db: Session) -> list[dict]:
-    games = db.query(GameModel).all()
+    games = (
+        db.query(GameModel)
+        .options(*GAME_SCHEMA_LOADERS)
+        .order_by(GameModel.sort_key, GameModel.id)
+        .all()
+    )
+    attach_location_paths(db, games)
     return [Game.model_validate(game).model_dump() for game in games]
 
 
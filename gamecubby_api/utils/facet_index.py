@@ -0,0 +1,171 @@
+import os
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.game import Game
+from .search_index import FACET_ARRAYS, FACET_SOURCES, facet_changes_since, get_facet_version
+
+# Opt-in: keep one bitmap of game IDs per facet value in each worker's memory.
+FACET_INDEX_ENABLED = os.getenv("SEARCH_FACET_INDEX", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _to_bitmap(game_ids: List[int]) -> int:
+    """
+    Pack game IDs into a Python int used as a bitset (bit N set = game N matches).
+    Built through a bytearray so construction stays linear in the highest ID.
+    """
+    if not game_ids:
+        return 0
+    buf = bytearray(max(game_ids) // 8 + 1)
+    for gid in game_ids:
+        buf[gid >> 3] |= 1 << (gid & 7)
+    return int.from_bytes(buf, "little")
+
+
+def bitmap_to_ids(bitmap: int) -> List[int]:
+    """
+    Expand a bitset back into sorted game IDs.
+    """
+    bits = bin(bitmap)[:1:-1]  # little-endian string of 0/1, without the '0b' prefix
+    out: List[int] = []
+    pos = bits.find("1")
+    while pos != -1:
+        out.append(pos)
+        pos = bits.find("1", pos + 1)
+    return out
+
+
+class FacetIndex:
+    """
+    Snapshot of every facet association table as bitmaps:
+      - bitmaps[facet][value_id] -> bitset of game IDs having that value
+      - values[facet][game_id]   -> the game's value IDs (for 'exact' and patching)
+
+    'any' is a union, 'all' an intersection and 'exact' an intersection whose
+    games carry no other value of that facet.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self.bitmaps: Dict[str, Dict[int, int]] = {}
+        self.values: Dict[str, Dict[int, FrozenSet[int]]] = {}
+
+    @classmethod
+    def build(cls, session: Session, version: int) -> "FacetIndex":
+        index = cls(version)
+        for facet, (game_col, value_col) in FACET_SOURCES.items():
+            by_value: Dict[int, List[int]] = defaultdict(list)
+            by_game: Dict[int, set] = defaultdict(set)
+            for game_id, value_id in session.execute(select(game_col, value_col)):
+                by_value[value_id].append(game_id)
+                by_game[game_id].add(value_id)
+            index.bitmaps[facet] = {value_id: _to_bitmap(ids) for value_id, ids in by_value.items()}
+            index.values[facet] = {game_id: frozenset(ids) for game_id, ids in by_game.items()}
+        return index
+
+    def patched(self, session: Session, version: int, game_ids: FrozenSet[int]) -> "FacetIndex":
+        """
+        Copy of this index at `version` with only `game_ids` re-read, from the facet
+        arrays on games (a deleted game simply loses all its bits).
+        """
+        rows = {}
+        if game_ids:
+            columns = [FACET_ARRAYS[facet] for facet in FACET_SOURCES]
+            stmt = select(Game.id, *columns).where(Game.id.in_(sorted(game_ids)))
+            rows = {row[0]: row[1:] for row in session.execute(stmt)}
+
+        index = FacetIndex(version)
+        for pos, facet in enumerate(FACET_SOURCES):
+            bitmaps = dict(self.bitmaps[facet])
+            values = dict(self.values[facet])
+            for gid in game_ids:
+                old = values.pop(gid, frozenset())
+                new = frozenset(rows[gid][pos] or ()) if gid in rows else frozenset()
+                bit = 1 << gid
+                for vid in old - new:
+                    remaining = bitmaps.get(vid, 0) & ~bit
+                    if remaining:
+                        bitmaps[vid] = remaining
+                    else:
+                        bitmaps.pop(vid, None)
+                for vid in new - old:
+                    bitmaps[vid] = bitmaps.get(vid, 0) | bit
+                if new:
+                    values[gid] = new
+            index.bitmaps[facet] = bitmaps
+            index.values[facet] = values
+        return index
+
+    def match(self, facet: str, value_ids: Sequence[int], mode: str) -> int:
+        values = self.bitmaps[facet]
+        wanted = set(value_ids)
+
+        if mode == "any":
+            result = 0
+            for vid in wanted:
+                result |= values.get(vid, 0)
+            return result
+
+        result = -1  # all bits set; narrowed by each required value
+        for vid in wanted:
+            result &= values.get(vid, 0)
+            if not result:
+                return 0
+
+        if mode == "exact":
+            by_game = self.values[facet]
+            size = len(wanted)
+            result = _to_bitmap([gid for gid in bitmap_to_ids(result) if len(by_game.get(gid, ())) == size])
+        return result
+
+
+_index_lock = RLock()
+_index: Optional[FacetIndex] = None
+
+
+def get_facet_index(session: Session) -> FacetIndex:
+    """
+    Return this worker's facet index at the current facet version (bumped only by writes
+    that change some game's facet links). Versions committed by this worker are applied
+    in place to just the games they touched; anything else triggers a full rebuild.
+    """
+    global _index
+    version = get_facet_version(session)
+    current = _index
+    if current is not None and current.version == version:
+        return current
+
+    with _index_lock:
+        current = _index
+        if current is None or current.version != version:
+            changed = None
+            if current is not None and current.version < version:
+                changed = facet_changes_since(current.version, version)
+            if changed is None:
+                current = FacetIndex.build(session, version)
+            else:
+                current = current.patched(session, version, changed)
+            _index = current
+        return current
+
+
+def match_facets(session: Session, filters: Sequence[Tuple[str, Sequence[int], str]]) -> Optional[List[int]]:
+    """
+    Resolve (facet, value_ids, match_mode) filters to the sorted list of matching game IDs.
+    Returns None when no facet filter applies (i.e. no restriction).
+    """
+    active = [(facet, ids, mode) for facet, ids, mode in filters if ids]
+    if not active:
+        return None
+
+    index = get_facet_index(session)
+    result = -1
+    for facet, ids, mode in active:
+        result &= index.match(facet, ids, mode)
+        if not result:
+            return []
+    return bitmap_to_ids(result)
@@ -1,10 +1,9 @@
 from sqlalchemy.orm import Session
 from .formatting import format_igdb_game
-from .location import get_location_path, get_default_location_id
+from .location import attach_location_paths, get_default_location_id
 from .mode import upsert_mode
 from ..models import game_tags, game_platforms
-from ..models.location import Location
-from ..schemas.game import GamePreview, PlatformPreview
+from ..schemas.game import GamePreview, PlatformPreview, Game as GameSchema, GameCard, GameListItem
 from ..utils.external import fetch_igdb_game, fetch_igdb_collection
 from ..utils.platform import upsert_platform
 from ..utils.collection import create_collection
@@ -15,35 +14,82 @@ from ..models.mode import Mode
 from ..models.platform import Platform
 from ..models.genre import Genre
 from ..utils.igdb_tag import upsert_igdb_tags
-from sqlalchemy.orm import selectinload
+from ..utils.search_index import (
+    sync_game_search_fields, bump_search_generation, get_search_generation, record_facet_changes,
+)
+from ..utils.pagination import fetch_page
+from sqlalchemy.orm import selectinload, joinedload, load_only
 from sqlalchemy import func
 from ..models.playerperspective import PlayerPerspective
 from ..models.company import Company
 from ..models.game_company import GameCompany
 from ..utils.external import get_igdb_token, _get_igdb_credentials
-from typing import List, Optional, cast, Dict, Tuple, Union
+from typing import List, Optional, cast, Dict, Tuple, Union, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
 import asyncio
+import hashlib
 import os
 import httpx
 
 
-def get_game(session: Session, game_id: int) -> Optional[Game]:
-    game = (
-        session.query(Game)
-        .options(
+# Everything GameSchema serializes: one SELECT ... IN per collection, collection joined in.
+# A page of N games costs a fixed number of queries instead of one lazy load per row.
+GAME_SCHEMA_LOADERS = (
+    joinedload(Game.collection),
+    selectinload(Game.platforms),
+    selectinload(Game.tags),
+    selectinload(Game.modes),
+    selectinload(Game.genres),
+    selectinload(Game.playerperspectives),
+    selectinload(Game.igdb_tags),
+    selectinload(Game.companies).joinedload(GameCompany.company),
+)
+
+# Named projections for ?fields=: the response schema plus the loader options that fetch
+# exactly the columns and relationships it serializes.
+GAME_PROJECTIONS: Dict[str, Tuple[Type[BaseModel], tuple]] = {
+    "card": (
+        GameCard,
+        (
+            load_only(Game.id, Game.name, Game.cover_url),
+            selectinload(Game.platforms),
+        ),
+    ),
+    "list": (
+        GameListItem,
+        (
+            load_only(
+                Game.id, Game.igdb_id, Game.name, Game.release_date, Game.cover_url, Game.condition,
+                Game.location_id, Game.order, Game.rating, Game.updated_at,
+            ),
+            joinedload(Game.collection),
             selectinload(Game.platforms),
             selectinload(Game.tags),
-            selectinload(Game.collection)
-        )
+        ),
+    ),
+    "full": (GameSchema, GAME_SCHEMA_LOADERS),
+}
+DEFAULT_PROJECTION = "full"
+
+
+def validate_projection(value: Optional[str]) -> str:
+    projection = (value or DEFAULT_PROJECTION).strip().lower()
+    if projection not in GAME_PROJECTIONS:
+        raise HTTPException(status_code=422, detail=f"fields must be one of: {', '.join(GAME_PROJECTIONS)}")
+    return projection
+
+
+def get_game(session: Session, game_id: int, projection: str = DEFAULT_PROJECTION) -> Optional[Game]:
+    game = (
+        session.query(Game)
+        .options(*GAME_PROJECTIONS[projection][1])
         .filter_by(id=game_id)
         .first()
     )
 
-    if game:
-        game.location_path = [
-            {"id": str(loc["id"]), "name": loc["name"]}
-            for loc in get_location_path(session, game.id)
-        ]
+    if game and "location_path" in GAME_PROJECTIONS[projection][0].model_fields:
+        attach_location_paths(session, [game])
 
     return game
 
@@ -56,38 +102,11 @@ def list_games(session: Session) -> List[Game]:
             selectinload(Game.tags),
             selectinload(Game.collection)
         )
+        .order_by(Game.sort_key, Game.id)
         .all()
     )
 
-    location_ids = set()
-    for game in games:
-        if game.location_id:
-            current_id = game.location_id
-            while current_id:
-                location_ids.add(current_id)
-                loc = session.query(Location.parent_id).filter_by(id=current_id).first()
-                current_id = loc[0] if loc else None
-
-    locations = (
-        session.query(Location)
-        .filter(Location.id.in_(location_ids))
-        .all()
-    ) if location_ids else []
-
-    loc_dict = {loc.id: loc for loc in locations}
-
-    for game in games:
-        game.location_path = []
-        current_id = game.location_id
-
-        while current_id in loc_dict:
-            loc = loc_dict[current_id]
-            game.location_path.insert(0, {
-                "id": str(loc.id),
-                "name": loc.name
-            })
-            current_id = loc.parent_id
-
+    attach_location_paths(session, games)
     return games
 
 
@@ -149,6 +168,8 @@ def create_game(session: Session, game_data: dict) -> Game:
         companies = session.query(Company).filter(Company.id.in_(company_ids)).all()
         game.companies = [GameCompany(company=c) for c in companies]
 
+    session.flush()
+    sync_game_search_fields(session, [game.id])
     session.commit()
     session.refresh(game)
     return game
@@ -238,6 +259,8 @@ def update_game(session: Session, game_id: int, update_data: dict) -> Optional[G
         if value is not None:
             setattr(game, key, value)
 
+    session.flush()
+    sync_game_search_fields(session, [game.id])
     session.commit()
     session.refresh(game)
 
@@ -260,6 +283,8 @@ def delete_game(session: Session, game_id: int) -> bool:
     if not game:
         return False
     session.delete(game)
+    record_facet_changes(session, [game_id])
+    bump_search_generation(session, [game_id])
     session.commit()
     return True
 
@@ -272,7 +297,7 @@ def list_games_by_tag(session: Session, tag_id: int) -> List[Game]:
         session.query(Game)
         .join(game_tags, Game.id == game_tags.c.game_id)
         .filter(game_tags.c.tag_id == tag_id)
-        .order_by(Game.name)
+        .order_by(Game.sort_key, Game.id)
         .all()
     )
 
@@ -285,7 +310,7 @@ def list_games_by_platform(session: Session, platform_id: int) -> List[Game]:
         session.query(Game)
         .join(game_platforms, Game.id == game_platforms.c.game_id)
         .filter(game_platforms.c.platform_id == platform_id)
-        .order_by(Game.name)
+        .order_by(Game.sort_key, Game.id)
         .all()
     )
 
@@ -297,7 +322,7 @@ def list_games_by_location(session: Session, location_id: int) -> List[Game]:
     games = (
         session.query(Game)
         .filter(Game.location_id == location_id)
-        .order_by(Game.name)
+        .order_by(Game.sort_key, Game.id)
         .all()
     )
     return cast(List[Game], games)
@@ -489,6 +514,8 @@ async def add_game_from_igdb(
         )
         game.companies.append(link)
 
+    session.flush()
+    sync_game_search_fields(session, [game.id])
     session.commit()
     session.refresh(game)
     return game
@@ -539,6 +566,8 @@ async def refresh_game_metadata(session: Session, game_id: int) -> Tuple[Optiona
     # IMPORTANT: Do not update platforms here.
     # We intentionally skip syncing platforms to preserve the user's owned selection.
 
+    session.flush()
+    sync_game_search_fields(session, [game.id])
     session.commit()
     session.refresh(game)
     return game, True, "Game metadata updated from IGDB."
@@ -593,25 +622,44 @@ def force_refresh_metadata(session: Session) -> Dict[str, int]:
     return refresh_all_games_metadata(session)
 
 
-def list_games_preview(db: Session) -> list[GamePreview]:
-    games = db.query(Game).all()
-    result = []
+# Only what GamePreview shows; platforms come in with one SELECT ... IN for the whole page
+GAME_PREVIEW_LOADERS = (
+    load_only(Game.id, Game.name, Game.cover_url, Game.release_date, Game.summary),
+    selectinload(Game.platforms).load_only(Platform.id, Platform.name),
+)
 
-    for game in games:
-        preview = GamePreview(
+
+def list_games_preview(
+    db: Session, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> Tuple[List[GamePreview], Optional[str]]:
+    """
+    Games in name order as previews, optionally one keyset page at a time.
+    Returns (previews, next_cursor); next_cursor is None on the last page.
+    """
+    query = db.query(Game).options(*GAME_PREVIEW_LOADERS)
+    games, next_cursor, _ = fetch_page(query, ("name", False), cursor, limit, None)
+
+    result = [
+        GamePreview(
             id=game.id,
             name=game.name,
             cover_url=game.cover_url,
             release_date=game.release_date,
             summary=game.summary,
-            platforms=[
-                PlatformPreview(
-                    id=platform.id,
-                    name=platform.name
-                )
-                for platform in game.platforms
-            ]
+            platforms=[PlatformPreview(id=platform.id, name=platform.name) for platform in game.platforms],
         )
-        result.append(preview)
+        for game in games
+    ]
+    return result, next_cursor
+
 
-    return result
+def games_preview_etag(db: Session, limit: Optional[int], cursor: Optional[str], fresh: bool = False) -> str:
+    """
+    Weak ETag for a /games/ listing page. Every write that can change a preview bumps
+    the search generation, so (generation, page params) identifies the response.
+
+    Pass fresh=True when answering If-None-Match: the cached generation may lag another
+    worker's commit by up to SEARCH_GENERATION_TTL, which must not turn into a 304.
+    """
+    digest = hashlib.sha1(f"{limit}:{cursor}".encode()).hexdigest()[:16]
+    return f'W/"{get_search_generation(db, fresh)}-{digest}"'
@@ -5,6 +5,7 @@ import asyncio
 import os
 import httpx
 from .external import get_igdb_token, _get_igdb_credentials
+from .search_index import sync_game_search_fields, bump_search_generation
 
 
 def upsert_companies(db: Session, company_data: list[dict]) -> list[Company]:
@@ -16,6 +17,7 @@ def upsert_companies(db: Session, company_data: list[dict]) -> list[Company]:
         if not company:
             company = Company(id=company_id, name=name)
             db.add(company)
+            bump_search_generation(db)
             db.commit()
             db.refresh(company)
         companies.append(company)
@@ -52,6 +54,10 @@ async def sync_company_names(db: Session) -> int:
 
         await asyncio.sleep(0.5)
 
+    if updated:
+        # company names feed every linked game's search vector
+        db.flush()
+        sync_game_search_fields(db)
     db.commit()
     print(f"Updated {updated} company names.")
     return updated
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, insert, delete
 from ..models.game_platform import game_platforms
 from ..models.game import Game
+from .search_index import sync_game_search_fields
 from ..models.platform import Platform
 
 
@@ -24,6 +25,7 @@ def attach_platform(session: Session, game_id: int, platform_id: int) -> bool:
     session.execute(
         insert(game_platforms).values(game_id=game_id, platform_id=platform_id)
     )
+    sync_game_search_fields(session, [game_id])
     session.commit()
     return True
 
@@ -35,6 +37,7 @@ def detach_platform(session: Session, game_id: int, platform_id: int) -> bool:
             game_platforms.c.platform_id == platform_id,
         )
     )
+    sync_game_search_fields(session, [game_id])
     session.commit()
     return True
 
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, insert, delete
 from ..models.game_tag import game_tags
 from ..models.game import Game
+from .search_index import sync_game_search_fields
 from ..models.tag import Tag
 
 
@@ -24,6 +25,7 @@ def attach_tag(session: Session, game_id: int, tag_id: int) -> bool:
     session.execute(
         insert(game_tags).values(game_id=game_id, tag_id=tag_id)
     )
+    sync_game_search_fields(session, [game_id])
     session.commit()
     return True
 
@@ -35,6 +37,7 @@ def detach_tag(session: Session, game_id: int, tag_id: int) -> bool:
             game_tags.c.tag_id == tag_id,
         )
     )
+    sync_game_search_fields(session, [game_id])
     session.commit()
     return True
 
@@ -2,6 +2,7 @@ import httpx
 from sqlalchemy.orm import Session
 from ..models.genre import Genre
 from ..utils.external import get_igdb_token, _get_igdb_credentials
+from .search_index import bump_search_generation
 
 
 async def sync_genres(db: Session) -> list[dict]:
@@ -30,5 +31,6 @@ async def sync_genres(db: Session) -> list[dict]:
         else:
             db.add(Genre(id=genre["id"], name=genre["name"]))
 
+    bump_search_generation(db)
     db.commit()
     return igdb_genres
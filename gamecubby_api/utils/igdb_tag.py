@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from ..models.igdb_tag import IGDBTag
 from ..utils.external import get_igdb_token, _get_igdb_credentials
 from collections import defaultdict
+from .search_index import bump_search_generation
 
 TAG_TYPE_ENDPOINTS = {
     0: "themes",
@@ -55,5 +56,7 @@ async def upsert_igdb_tags(db: Session, tag_numbers: list[int]) -> list[IGDBTag]
             existing_map[tag_number] = tag
             new_tags.append(tag)
 
+    if new_tags:
+        bump_search_generation(db)
     db.commit()
     return [existing_map[tag] for tag in tag_numbers if tag in existing_map]
\ No newline at end of file
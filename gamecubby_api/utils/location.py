@@ -1,16 +1,32 @@
-from collections import defaultdict
-from typing import Optional, List, DefaultDict, Tuple
-from sqlalchemy import func
+from typing import Optional, List, Tuple, Dict, Iterable
+from sqlalchemy import literal
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, delete, and_, func
 from ..models.location import Location
+from ..models.location_closure import location_closure
 from ..models.game import Game
+from .search_index import bump_search_generation, sync_location_keys
+from .location_cache import bump_location_version, get_location_snapshot
 
 
 def create_location(session: Session, name: str, parent_id: Optional[int] = None,
                     type: Optional[str] = None) -> Location:
     location = Location(name=name, parent_id=parent_id, type=type)
     session.add(location)
+    session.flush()
+
+    # Closure rows: itself at depth 0, plus one per ancestor of the parent
+    rows = select(literal(location.id), literal(location.id), literal(0))
+    if parent_id is not None:
+        rows = rows.union_all(
+            select(location_closure.c.ancestor_id, literal(location.id), location_closure.c.depth + 1)
+            .where(location_closure.c.descendant_id == parent_id)
+        )
+    session.execute(
+        location_closure.insert().from_select(["ancestor_id", "descendant_id", "depth"], rows)
+    )
+    bump_location_version(session)
+    bump_search_generation(session, [])
     session.commit()
     session.refresh(location)
     return location
@@ -32,32 +48,87 @@ def list_all_locations(session: Session) -> list[Location]:
     return session.query(Location).order_by(Location.name).all()
 
 
+def get_location_tree(session: Session) -> List[dict]:
+    """
+    The whole locations hierarchy as nested dicts (roots first, siblings by name), each
+    with `game_count` (games stored directly there) and `subtree_game_count` (there or
+    anywhere beneath). One query fetches every location with its grouped game count;
+    nesting and subtree sums are assembled in memory.
+    """
+    counts = (
+        select(Game.location_id, func.count().label("n"))
+        .where(Game.location_id.isnot(None))
+        .group_by(Game.location_id)
+        .subquery()
+    )
+    rows = session.execute(
+        select(Location.id, Location.name, Location.parent_id, Location.type, func.coalesce(counts.c.n, 0))
+        .outerjoin(counts, counts.c.location_id == Location.id)
+        .order_by(Location.name, Location.id)
+    ).all()
+
+    nodes = {
+        loc_id: {
+            "id": loc_id, "name": name, "parent_id": parent_id, "type": type_,
+            "game_count": n, "subtree_game_count": n, "children": [],
+        }
+        for loc_id, name, parent_id, type_, n in rows
+    }
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        (parent["children"] if parent else roots).append(node)
+
+    # Post-order sums; iterative so deep trees can't hit the recursion limit
+    stack = [(node, False) for node in roots]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            node["subtree_game_count"] += sum(c["subtree_game_count"] for c in node["children"])
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node["children"])
+    return roots
+
+
 def get_location_path(session: Session, game_id: int) -> list[dict]:
     """
     Returns complete location path from root to game's location.
     Guaranteed order: [root, ..., parent, current].
     Returns an empty list if game has no location.
     """
-    game = session.query(Game).filter_by(id=game_id).first()
-    if not game or not game.location_id:
+    location_id = session.query(Game.location_id).filter_by(id=game_id).scalar()
+    if not location_id:
         return []
+    return get_location_paths(session, [location_id]).get(location_id, [])
 
-    location_ids = []
-    current_id = game.location_id
 
-    while current_id:
-        location_ids.append(current_id)
-        parent = session.query(Location.parent_id).filter_by(id=current_id).first()
-        current_id = parent[0] if parent else None
+def get_location_paths(session: Session, location_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """
+    Resolve root-to-node paths for many locations from this worker's location snapshot
+    (utils.location_cache): dictionary reads, no query while the tree is unchanged.
+
+    Returns {location_id: [{"id": ..., "name": ...}, ...]} ordered [root, ..., current].
+    Unknown IDs are omitted.
+    """
+    snapshot = get_location_snapshot(session)
+    return {
+        loc_id: list(snapshot.paths[loc_id])
+        for loc_id in {int(i) for i in location_ids if i}
+        if loc_id in snapshot.paths
+    }
 
-    locations = session.query(Location).filter(Location.id.in_(location_ids)).all()
-    loc_dict = {loc.id: loc for loc in locations}
 
-    return [
-        {"id": loc.id, "name": loc.name}
-        for loc_id in reversed(location_ids)
-        if (loc := loc_dict.get(loc_id))
-    ]
+def attach_location_paths(session: Session, games: Iterable[Game]) -> None:
+    """
+    Set `location_path` ([root, ..., current]) on every game, resolving the paths of
+    all their locations with one get_location_paths() call. Used wherever games are
+    serialized with their paths: single game, listings, search and export.
+    """
+    games = list(games)
+    paths = get_location_paths(session, {g.location_id for g in games if g.location_id})
+    for game in games:
+        game.location_path = paths.get(game.location_id, [])
 
 
 def get_default_location_id(session: Session) -> Optional[int]:
@@ -88,7 +159,10 @@ def delete_location(session: Session, location_id: int) -> bool:
     if has_games:
         return False
 
+    session.execute(delete(location_closure).where(location_closure.c.descendant_id == location_id))
     session.delete(loc)
+    bump_location_version(session)
+    bump_search_generation(session, [])
     session.commit()
     return True
 
@@ -107,6 +181,13 @@ def rename_location(session: Session, location_id: int, new_name: str) -> Option
         raise ValueError("Location name cannot be empty")
 
     loc.name = clean
+    bump_location_version(session)
+    session.flush()
+    subtree = [location_id, *get_descendant_location_ids(session, location_id)]
+    sync_location_keys(session, subtree)
+    # q= loc:"..." matches by name, so every game in the subtree may enter or leave a result
+    renamed_games = session.query(Game.id).filter(Game.location_id.in_(subtree)).all()
+    bump_search_generation(session, [gid for (gid,) in renamed_games])
     session.commit()
     session.refresh(loc)
     return loc
@@ -134,72 +215,96 @@ def migrate_location_games(session: Session, source_location_id: int, target_loc
         .filter(Game.location_id == source_location_id)
         .update({Game.location_id: target_location_id}, synchronize_session=False)
     )
+    sync_location_keys(session, [target_location_id])
+    bump_search_generation(session)
     session.commit()
     return int(affected or 0)
 
 
-def get_descendant_location_ids_from_snapshot(session: Session, root_id: int) -> List[int]:
+def get_descendant_location_ids(session: Session, root_id: int) -> List[int]:
     """
-    Compute ALL descendant location IDs under `root_id` using a single snapshot
-    query of the entire locations table, then in-memory BFS over a parent->children
-    map. Excludes `root_id` itself.
-
-    This avoids multiple DB roundtrips and works regardless of ORM row/tuple quirks.
+    Returns all descendant location IDs under root_id (excludes root_id), read from
+    this worker's location snapshot.
     """
-    rows: list[tuple[int, int | None]] = [
-        (loc.id, loc.parent_id) for loc in session.query(Location.id, Location.parent_id).all()
-    ]
-
-    children_map: DefaultDict[int, List[int]] = defaultdict(list)
-    for loc_id, parent_id in rows:
-        if parent_id is not None:
-            children_map[parent_id].append(loc_id)
+    return get_location_snapshot(session).descendants(root_id)
 
-    descendants: List[int] = []
-    frontier: List[int] = children_map.get(root_id, []).copy()
 
-    while frontier:
-        next_frontier: List[int] = []
-        for lid in frontier:
-            descendants.append(lid)
-            kids = children_map.get(lid, [])
-            if kids:
-                next_frontier.extend(kids)
-        frontier = next_frontier
-
-    return descendants
-
-
-def get_descendant_location_ids(session, root_id: int) -> list[int]:
+def subtree_location_ids(root_id, include_root: bool = True):
     """
-    Returns all descendant location IDs under root_id (excludes root_id).
-    Implemented with SQLAlchemy Core recursive CTE (no raw SQL).
+    SELECT of the location IDs at or under `root_id` (an ID or a scalar SQL expression),
+    for use as `Game.location_id.in_(subtree_location_ids(...))`.
     """
-    from sqlalchemy import select
-    from sqlalchemy.orm import aliased
-    from ..models.location import Location
-
-    sub = select(Location.id).where(Location.parent_id == root_id).cte(name="sub", recursive=True)
+    query = select(location_closure.c.descendant_id).where(location_closure.c.ancestor_id == root_id)
+    if not include_root:
+        query = query.where(location_closure.c.depth > 0)
+    return query
 
-    L = aliased(Location)
 
-    sub = sub.union_all(
-        select(L.id).where(L.parent_id == sub.c.id)
+def reparent_location(session: Session, location_id: int, new_parent_id: Optional[int]) -> Optional[Location]:
+    """
+    Move a location, with everything beneath it, under `new_parent_id` (None = make it a root).
+    Returns the updated Location or None if not found.
+    Raises ValueError if the new parent doesn't exist or lies inside the moved subtree.
+    """
+    loc = session.query(Location).filter_by(id=location_id).first()
+    if not loc:
+        return None
+    if new_parent_id is not None:
+        if not session.query(Location.id).filter_by(id=new_parent_id).first():
+            raise ValueError("Parent location does not exist")
+        inside = session.execute(
+            select(location_closure.c.depth).where(
+                location_closure.c.ancestor_id == location_id,
+                location_closure.c.descendant_id == new_parent_id,
+            )
+        ).first()
+        if inside:
+            raise ValueError("A location cannot be moved beneath itself")
+
+    bump_location_version(session)
+    subtree = [location_id, *get_descendant_location_ids(session, location_id)]
+
+    # Detach the subtree from its old ancestors, then graft it under the new parent's
+    session.execute(
+        delete(location_closure).where(
+            location_closure.c.descendant_id.in_(subtree),
+            location_closure.c.ancestor_id.notin_(subtree),
+        )
     )
-
-    rows = session.execute(select(sub.c.id)).scalars().all()
-    return list(rows)
+    if new_parent_id is not None:
+        above = location_closure.alias("above")
+        below = location_closure.alias("below")
+        session.execute(
+            location_closure.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+                .select_from(above.join(below, and_(
+                    above.c.descendant_id == new_parent_id,
+                    below.c.ancestor_id == location_id,
+                ))),
+            )
+        )
+
+    loc.parent_id = new_parent_id
+    session.flush()
+    sync_location_keys(session, subtree)
+    # Location filters with descendants now match a different set for these games
+    moved_games = session.query(Game.id).filter(Game.location_id.in_(subtree)).all()
+    bump_search_generation(session, [gid for (gid,) in moved_games])
+    session.commit()
+    session.refresh(loc)
+    return loc
 
 
 def list_games_id_name_by_location(session: Session, location_id: int) -> List[Tuple[int, str]]:
     """
     Return (id, name) pairs for games assigned exactly to the given location_id.
-    Sorted case-insensitively by name. Lightweight (selects only two columns).
+    Sorted naturally by name (games.sort_key). Lightweight (selects only two columns).
     """
     rows = (
         session.query(Game.id, Game.name)
         .filter(Game.location_id == location_id)
-        .order_by(func.lower(Game.name))
+        .order_by(Game.sort_key, Game.id)
         .all()
     )
     return [(r[0], r[1]) for r in rows]
@@ -0,0 +1,106 @@
+import os
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.location import Location
+from .version_counter import VersionCounter
+
+# Bumped by every write to the locations table (create, delete, rename, reparent); each
+# worker keeps one snapshot of the tree and rebuilds it lazily once the version moves.
+location_version = VersionCounter(
+    "location_version",
+    ttl=float(os.getenv("LOCATION_VERSION_TTL", "1.0")),
+    flag="location_version_bumped",
+)
+
+_snapshot_lock = RLock()
+_snapshot: Optional["LocationSnapshot"] = None
+
+
+class LocationSnapshot:
+    """
+    Immutable in-memory copy of the locations tree, built from (id, name, parent_id, type) rows:
+      - locations[id]: (name, parent_id, type)
+      - children[id] / roots: child IDs sorted by name
+      - paths[id]: [{"id", "name"}, ...] ordered [root, ..., id]
+    Locations caught in a parent_id cycle are unreachable from a root and get no path.
+    """
+
+    def __init__(self, version: int, rows: List[Tuple[int, str, Optional[int], Optional[str]]]):
+        self.version = version
+        self.locations: Dict[int, Tuple[str, Optional[int], Optional[str]]] = {
+            loc_id: (name, parent_id, type_) for loc_id, name, parent_id, type_ in rows
+        }
+        self.children: Dict[int, List[int]] = defaultdict(list)
+        self.roots: List[int] = []
+        for loc_id, name, parent_id, _ in sorted(rows, key=lambda r: (r[1], r[0])):
+            if parent_id in self.locations:
+                self.children[parent_id].append(loc_id)
+            else:
+                self.roots.append(loc_id)
+
+        self.paths: Dict[int, List[dict]] = {}
+        frontier = [(loc_id, []) for loc_id in self.roots]
+        while frontier:
+            loc_id, parent_path = frontier.pop()
+            path = parent_path + [{"id": loc_id, "name": self.locations[loc_id][0]}]
+            self.paths[loc_id] = path
+            frontier.extend((child, path) for child in self.children.get(loc_id, []))
+
+    def path(self, location_id: int) -> List[dict]:
+        return self.paths.get(location_id, [])
+
+    def descendants(self, location_id: int) -> List[int]:
+        """All location IDs beneath `location_id` (excluding it), breadth-first."""
+        out: List[int] = []
+        frontier = list(self.children.get(location_id, []))
+        while frontier:
+            out.extend(frontier)
+            frontier = [child for loc_id in frontier for child in self.children.get(loc_id, [])]
+        return out
+
+
+def bump_location_version(session: Session) -> None:
+    """
+    Increment the location version inside the caller's transaction. Every write to the
+    locations table (create, delete, rename, reparent) must call this before committing.
+    """
+    location_version.bump(session)
+
+
+def get_location_version(session: Session, fresh: bool = False) -> int:
+    return location_version.get(session, fresh)
+
+
+def _load_snapshot(session: Session, version: int) -> LocationSnapshot:
+    rows = session.execute(select(Location.id, Location.name, Location.parent_id, Location.type)).all()
+    return LocationSnapshot(version, rows)
+
+
+def get_location_snapshot(session: Session) -> LocationSnapshot:
+    """
+    Return this worker's snapshot of the locations tree, (re)loading it on first use and
+    whenever the location version has moved since it was built.
+
+    A session with an uncommitted location write gets a private snapshot of what it can
+    see, so it never reads its own stale tree nor publishes rows that may roll back.
+    """
+    global _snapshot
+    if session.info.get("location_version_bumped"):
+        return _load_snapshot(session, -1)
+
+    version = get_location_version(session)
+    current = _snapshot
+    if current is not None and current.version == version:
+        return current
+
+    with _snapshot_lock:
+        current = _snapshot
+        if current is None or current.version != version:
+            current = _load_snapshot(session, version)
+            _snapshot = current
+        return current
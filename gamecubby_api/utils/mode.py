@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from .external import get_igdb_token, _get_igdb_credentials
 from ..models.mode import Mode
 from ..models.game import Game
+from ..models.game_mode import game_modes
+from .search_index import bump_search_generation, sync_game_search_fields
 
 
 def upsert_mode(db: Session, mode_id: int, name: str) -> Mode:
@@ -15,10 +17,14 @@ def upsert_mode(db: Session, mode_id: int, name: str) -> Mode:
     if not mode:
         mode = Mode(id=mode_id, name=name)
         db.add(mode)
+        bump_search_generation(db, [])
         db.commit()
         db.refresh(mode)
     elif mode.name != name:
         mode.name = name
+        # q= mode:"..." matches by name, so the mode's games may enter or leave a result
+        game_ids = [gid for (gid,) in db.query(game_modes.c.game_id).filter(game_modes.c.mode_id == mode_id)]
+        bump_search_generation(db, game_ids)
         db.commit()
     return mode
 
@@ -34,6 +40,8 @@ def assign_mode_to_game(db: Session, game_id: int, mode_id: int) -> bool:
         return False
     if mode not in game.modes:
         game.modes.append(mode)
+        db.flush()
+        sync_game_search_fields(db, [game_id])
         db.commit()
     return True
 
@@ -45,6 +53,8 @@ def remove_mode_from_game(db: Session, game_id: int, mode_id: int) -> bool:
         return False
     if mode in game.modes:
         game.modes.remove(mode)
+        db.flush()
+        sync_game_search_fields(db, [game_id])
         db.commit()
     return True
 
@@ -0,0 +1,189 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_, ColumnElement
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import func
+
+from ..models.game import Game
+
+
+# sort= name -> leading sort expression; each is indexed together with id (ix_games_*_id),
+# so ordered pages in either direction are index scans. NULLs are folded to a sentinel so
+# keyset comparisons stay total.
+SORT_COLUMNS = {
+    "name": Game.sort_key,
+    "year": func.coalesce(Game.release_date, 0),
+    "rating": func.coalesce(Game.rating, -1),
+    "added": Game.created_at,
+    "location": Game.location_key,
+    "platforms": func.cardinality(Game.platform_ids),
+}
+
+# Python type of each sort expression's value, as carried in cursors
+SORT_VALUE_TYPES = {
+    "name": str,
+    "year": int,
+    "rating": int,
+    "added": int,
+    "location": str,
+    "platforms": int,
+}
+
+
+def validate_sort(value: str | None) -> tuple[str, bool]:
+    """
+    Parse sort= ('year', '-added', ...) into (column name, descending). Default: name ascending.
+    """
+    raw = (value or "name").strip().lower()
+    descending = raw.startswith("-")
+    name = raw.lstrip("-")
+    if name not in SORT_COLUMNS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"sort must be one of: {', '.join(SORT_COLUMNS)} (prefix '-' for descending)",
+        )
+    return name, descending
+
+
+def sort_key_columns(sort: tuple[str, bool] = ("name", False)) -> list[ColumnElement]:
+    # id breaks ties, which keeps the order total for keyset paging
+    return [SORT_COLUMNS[sort[0]], Game.id]
+
+
+def encode_cursor(sort: tuple[str, bool], values: list) -> str:
+    payload = {"sort": sort[0], "desc": sort[1], "after": values}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: tuple[str, bool]) -> list:
+    """
+    Decode a cursor issued by encode_cursor for the same `sort`, returning its
+    [sort value, id] key. Cursors from another sort or direction, or whose values don't
+    have the sort column's type, are rejected with 422 before any SQL is built.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("after"), list):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    if payload.get("sort") != sort[0] or payload.get("desc") is not sort[1]:
+        raise HTTPException(status_code=422, detail="Cursor was issued for a different sort")
+
+    values = payload["after"]
+    expected = (SORT_VALUE_TYPES[sort[0]], int)
+    if len(values) != len(expected) or not all(
+        isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, expected)
+    ):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return values
+
+
+def validate_count_mode(value: str | None) -> str | None:
+    if value is None or value == "":
+        return None
+    mode = value.lower()
+    if mode not in {"total", "has_more"}:
+        raise HTTPException(status_code=422, detail="count must be one of: total, has_more")
+    return mode
+
+
+def order_query(
+    query: Query,
+    sort: tuple[str, bool],
+    cursor: str | None,
+    offset: int | None,
+    rank: ColumnElement | None = None,
+) -> Query:
+    """
+    Order `query` by `sort` (after `rank`, descending, if given) and position it at
+    `cursor` or `offset`. Shared by paged and streamed results so both walk the same order.
+    A descending sort reverses every key, id included, so one index serves both directions.
+    """
+    if cursor and offset:
+        raise HTTPException(status_code=422, detail="cursor and offset cannot be combined")
+    if cursor and rank is not None:
+        raise HTTPException(status_code=422, detail="cursor is not supported with name_match=fuzzy")
+
+    sort_keys = sort_key_columns(sort)
+    descending = sort[1]
+    ordering = [key.desc() for key in sort_keys] if descending else list(sort_keys)
+    if rank is not None:
+        query = query.order_by(rank.desc(), *ordering)
+    else:
+        query = query.order_by(*ordering)
+    if cursor:
+        after = decode_cursor(cursor, sort)
+        if descending:
+            query = query.filter(tuple_(*sort_keys) < tuple_(*after))
+        else:
+            query = query.filter(tuple_(*sort_keys) > tuple_(*after))
+    if offset:
+        query = query.offset(offset)
+    return query
+
+
+def fetch_page(
+    query: Query,
+    sort: tuple[str, bool],
+    cursor: str | None,
+    limit: int | None,
+    offset: int | None,
+    rank: ColumnElement | None = None,
+    count: str | None = None,
+) -> tuple[list[Game], str | None, dict]:
+    """
+    Order `query` by `sort` (see validate_sort) and return one page, the opaque cursor of the next one
+    and any page metadata requested by `count`.
+
+    With a cursor, the page starts strictly after the encoded sort key (keyset paging), so
+    every page costs the same index range scan and rows don't shift when games are added.
+    One extra row is fetched to know whether a next page exists.
+
+    A `rank` (e.g. fuzzy similarity) is ordered by first, descending; ranked pages are
+    offset-only and carry no cursor.
+
+    `count`:
+      - 'has_more': report whether another page exists (free, from the extra row)
+      - 'total': also report the size of the whole filtered set, carried on every row of
+        the page query itself: COUNT(*) OVER () for offset pages, or a scalar count over
+        the same filtered query (before the cursor predicate) for keyset pages
+    """
+    filtered = query.order_by(None)
+    total_col = None
+    if count == "total":
+        if cursor:
+            total_col = select(func.count()).select_from(filtered.statement.subquery()).scalar_subquery()
+        else:
+            total_col = func.count().over()
+
+    query = order_query(query, sort, cursor, offset, rank)
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    columns = sort_key_columns(sort)
+    if total_col is not None:
+        columns.append(total_col.label("total"))
+    rows = query.add_columns(*columns).all()
+
+    meta: dict = {}
+    if total_col is not None:
+        if rows:
+            meta["total"] = rows[0][-1]
+        else:
+            # Past the end: no row to carry the count, so ask for it directly
+            meta["total"] = filtered.count() if (cursor or offset) else 0
+        rows = [row[:-1] for row in rows]
+
+    has_more = limit is not None and len(rows) > limit
+    next_cursor = None
+    if has_more:
+        rows = rows[:limit]
+        if rows and rank is None:
+            next_cursor = encode_cursor(sort, list(rows[-1][1:]))
+    if count is not None:
+        meta["has_more"] = has_more
+    return [row[0] for row in rows], next_cursor, meta
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from ..models.platform import Platform
+from ..models.game_platform import game_platforms
 from typing import Optional
+from .search_index import bump_search_generation
 
 
 def upsert_platform(session: Session, platform_data: dict) -> Platform:
@@ -19,6 +21,12 @@ def upsert_platform(session: Session, platform_data: dict) -> Platform:
             platform.slug = platform_data.get("slug")
             changed = True
         if changed:
+            # q= platform:"..." matches by name and slug, so the platform's games may enter or leave a result
+            game_ids = [
+                gid for (gid,) in
+                session.query(game_platforms.c.game_id).filter(game_platforms.c.platform_id == platform.id)
+            ]
+            bump_search_generation(session, game_ids)
             session.commit()
     else:
         platform = Platform(**platform_data)
@@ -3,6 +3,7 @@ import httpx
 from sqlalchemy.orm import Session
 from ..models.playerperspective import PlayerPerspective
 from ..utils.external import get_igdb_token, _get_igdb_credentials
+from .search_index import bump_search_generation
 
 
 async def sync_player_perspectives(db: Session) -> int:
@@ -36,6 +37,7 @@ async def sync_player_perspectives(db: Session) -> int:
                 existing.name = entry["name"]
         else:
             db.add(PlayerPerspective(id=entry["id"], name=entry["name"]))
+    bump_search_generation(db)
     db.commit()
     return len(data)
 
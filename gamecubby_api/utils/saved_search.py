@@ -0,0 +1,213 @@
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import delete, event, func, insert, select, any_, literal, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from starlette.datastructures import QueryParams
+
+from ..db import SessionLocal
+from ..models.game import Game
+from ..models.saved_search import SavedSearch, saved_search_changes
+from .game import GAME_PROJECTIONS, validate_projection
+from .pagination import fetch_page, validate_count_mode, validate_sort
+from .search import _parse_advanced_filters, _apply_advanced_filters, _serialize_games
+
+# Paging and response-shape params belong to a view, not to what a saved search matches
+_VIEW_PARAMS = {"limit", "offset", "cursor", "fields", "count", "sort"}
+
+
+def _param_pairs(params: dict) -> list[list[str]]:
+    pairs: list[list[str]] = []
+    for key, value in params.items():
+        if key in _VIEW_PARAMS:
+            continue
+        for v in value if isinstance(value, list) else [value]:
+            if v is not None and v != "":
+                pairs.append([key, str(v)])
+    return pairs
+
+
+def _filters(saved: SavedSearch) -> dict:
+    return _parse_advanced_filters(QueryParams([tuple(p) for p in saved.params]))
+
+
+def _matching_ids(
+    session: Session, filters: dict, restrict_to: Optional[list[int]] = None, use_facet_index: bool = True
+) -> list[int]:
+    query, _ = _apply_advanced_filters(session, session.query(Game.id), filters, use_facet_index)
+    if restrict_to is not None:
+        query = query.filter(Game.id.in_(restrict_to))
+    return sorted(gid for (gid,) in query.all())
+
+
+def _snapshot_xmin(session: Session) -> int:
+    """
+    Oldest transaction still running as of now: every write logged by an older one is
+    committed (or rolled back) and visible to the statements that follow.
+    """
+    return session.execute(select(func.txid_snapshot_xmin(func.txid_current_snapshot()))).scalar_one()
+
+
+def _pending_changes(session: Session, saved: SavedSearch) -> set:
+    """Game IDs logged since the saved search was last brought up to date (None = any game)."""
+    rows = session.execute(
+        select(saved_search_changes.c.game_id).where(saved_search_changes.c.xid >= saved.changes_seen).distinct()
+    )
+    return {game_id for (game_id,) in rows}
+
+
+def _materialize(session: Session, saved: SavedSearch) -> None:
+    saved.changes_seen = _snapshot_xmin(session)
+    saved.game_ids = _matching_ids(session, _filters(saved))
+    saved.refreshed_at = int(time.time())
+
+
+def _prune_changes(session: Session) -> None:
+    """Drop log rows every saved search has already applied."""
+    floor = select(func.coalesce(func.min(SavedSearch.changes_seen), _snapshot_xmin(session))).scalar_subquery()
+    session.execute(delete(saved_search_changes).where(saved_search_changes.c.xid < floor))
+
+
+def describe_saved_search(session: Session, saved: SavedSearch) -> dict:
+    params: dict[str, list[str]] = {}
+    for key, value in saved.params:
+        params.setdefault(key, []).append(value)
+    return {
+        "id": saved.id,
+        "name": saved.name,
+        "params": params,
+        "total": len(saved.game_ids or []),
+        "stale": bool(_pending_changes(session, saved)),
+        "refreshed_at": saved.refreshed_at,
+    }
+
+
+def create_saved_search(session: Session, name: str, params: dict) -> SavedSearch:
+    """
+    Persist a named advanced-search parameter set and materialize its matches.
+    Raises 422 if it has no filters, 409 if the name is taken.
+    """
+    clean = (name or "").strip()
+    if not clean:
+        raise HTTPException(status_code=422, detail="Saved search name cannot be empty")
+    if session.query(SavedSearch.id).filter_by(name=clean).first():
+        raise HTTPException(status_code=409, detail="A saved search with this name already exists")
+
+    pairs = _param_pairs(params)
+    if not _parse_advanced_filters(QueryParams([tuple(p) for p in pairs]))["present"]:
+        raise HTTPException(status_code=400, detail="No valid filters provided")
+
+    saved = SavedSearch(name=clean, params=pairs)
+    _materialize(session, saved)
+    session.add(saved)
+    session.flush()
+    _prune_changes(session)
+    session.commit()
+    session.refresh(saved)
+    return saved
+
+
+def get_saved_search(session: Session, saved_id: int) -> SavedSearch:
+    """
+    Retrieve a saved search by ID or raise 404.
+    """
+    saved = session.query(SavedSearch).filter_by(id=saved_id).first()
+    if not saved:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return saved
+
+
+def list_saved_searches(session: Session) -> list[SavedSearch]:
+    return session.query(SavedSearch).order_by(SavedSearch.name).all()
+
+
+def delete_saved_search(session: Session, saved_id: int) -> None:
+    saved = get_saved_search(session, saved_id)
+    session.delete(saved)
+    session.flush()
+    _prune_changes(session)
+    session.commit()
+
+
+def _ensure_fresh(session: Session, saved: SavedSearch) -> SavedSearch:
+    """
+    Apply the changes logged since the saved search was last viewed: only the logged
+    games are re-evaluated, unless some write could have changed any game. Runs under a
+    lock on this one row, so concurrent views apply each change once.
+    """
+    if not _pending_changes(session, saved):
+        return saved
+    saved = (
+        session.query(SavedSearch)
+        .filter_by(id=saved.id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+    # Taken before reading the log: changes from transactions still running now are
+    # read again next time, and re-evaluating a game is idempotent.
+    seen = _snapshot_xmin(session)
+    pending = _pending_changes(session, saved)
+    if None in pending:
+        _materialize(session, saved)
+    elif pending:
+        changed = sorted(pending)
+        matched = _matching_ids(session, _filters(saved), changed, use_facet_index=False)
+        kept = {gid for gid in saved.game_ids if gid not in pending}
+        ids = sorted(kept.union(matched))
+        if ids != list(saved.game_ids):
+            saved.game_ids = ids
+            saved.refreshed_at = int(time.time())
+    saved.changes_seen = seen
+    session.flush()
+    _prune_changes(session)
+    session.commit()
+    return saved
+
+
+def get_saved_search_results(
+    session: Session,
+    saved_id: int,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    count: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+) -> dict:
+    """
+    Page through a saved search's materialized matches in `sort` order (name by default).
+    The page query is a primary-key membership test on the stored ID set; the filters
+    themselves only run again for games written since the set was last viewed.
+    """
+    count = validate_count_mode(count)
+    sort_by = validate_sort(sort)
+    projection = validate_projection(fields)
+    saved = _ensure_fresh(session, get_saved_search(session, saved_id))
+
+    query = (
+        session.query(Game)
+        .options(*GAME_PROJECTIONS[projection][1])
+        .filter(Game.id == any_(literal(list(saved.game_ids), ARRAY(Integer))))
+    )
+    results, next_cursor, meta = fetch_page(query, sort_by, cursor, limit, offset, count=count)
+    return {"results": _serialize_games(session, results, projection), "next_cursor": next_cursor, **meta}
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _log_search_changes(session: Session) -> None:
+    """
+    Log what bump_search_generation recorded for this transaction. Only an insert: the
+    saved searches themselves are patched lazily when viewed (_ensure_fresh).
+    """
+    changed_all = session.info.pop("search_changed_all", False)
+    changed_ids = session.info.pop("search_changed_game_ids", None)
+    if changed_all:
+        rows = [{"game_id": None}]
+    elif changed_ids:
+        rows = [{"game_id": gid} for gid in sorted(changed_ids)]
+    else:
+        return
+    session.connection().execute(insert(saved_search_changes), rows)
@@ -1,21 +1,43 @@
+import os
+import re
+from functools import lru_cache
+from typing import Iterator
+
 from fastapi import Request, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, any_, literal, false, true, and_, or_, cast, Integer, ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, Query
 from sqlalchemy.sql import func
 
 from ..utils.db_tools import with_db
-from ..utils.location import get_location_path, get_descendant_location_ids_from_snapshot
+from ..utils.game import GAME_PROJECTIONS, validate_projection
+from ..utils.pagination import (
+    decode_cursor, fetch_page, order_query, validate_count_mode, validate_sort,
+)
+from ..utils.location import attach_location_paths, subtree_location_ids
+from ..utils.search_index import FTS_CONFIG, FACET_ARRAYS, get_search_generation, normalize_name
+from ..utils.search_cache import search_result_cache, canonical_key
+from ..utils.suggest_index import SUGGEST_SOURCES, suggest
+from ..utils.facet_index import FACET_INDEX_ENABLED, FACET_SOURCES, match_facets
 
 from ..models.game import Game
 from ..models.tag import Tag
 from ..models.platform import Platform
-from ..schemas.game import Game as GameSchema, LocationPathItem
 from ..models.genre import Genre
 from ..models.mode import Mode
 from ..models.playerperspective import PlayerPerspective
 from ..models.collection import Collection
-from ..models.company import Company
 from ..models.igdb_tag import IGDBTag
+from ..models.company import Company
 from ..models.location import Location
-from ..models.game_company import GameCompany  # association obj for companies
+from ..models.location_closure import location_closure
+
+# Default pg_trgm similarity cut-off for name_match=fuzzy (0..1, higher = stricter)
+FUZZY_THRESHOLD = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.3"))
+
+# Rows fetched per round trip when streaming results as NDJSON
+STREAM_BATCH_SIZE = 200
 
 
 def _validate_match_mode(value: str | None, field_name: str = "match_mode") -> str:
@@ -39,21 +61,156 @@ def _parse_int_list(values: list[str]) -> list[int]:
     return out
 
 
-def search_games_basic(request: Request) -> list[GameSchema]:
+def _facet_clause(facet: str, ids: list[int], mode: str) -> ColumnElement:
+    """
+    One predicate on the GIN-indexed games.<facet>_ids array:
+    any -> && (overlap), all -> @> (contains), exact -> @> and <@ (same set).
+    """
+    column = FACET_ARRAYS[facet]
+    if mode == "any":
+        return column.overlap(ids)
+    if mode == "exact":
+        return column.contains(ids) & column.contained_by(ids)
+    return column.contains(ids)
+
+
+def _apply_facet_filters(
+    db: Session,
+    query: Query,
+    filters: list[tuple[str, list[int], str]],
+    use_facet_index: bool = True,
+) -> Query:
+    """
+    Apply (facet, ids, match_mode) filters. With SEARCH_FACET_INDEX enabled they are
+    resolved against the in-memory bitmaps and collapse into a single id = ANY(...)
+    predicate; otherwise each becomes one array predicate on the games row.
+
+    Pass use_facet_index=False to match against uncommitted rows of the current
+    transaction, which the bitmaps (built from committed data) cannot see.
+    """
+    if FACET_INDEX_ENABLED and use_facet_index:
+        matched = match_facets(db, filters)
+        if matched is None:
+            return query
+        if not matched:
+            return query.filter(false())
+        return query.filter(Game.id == any_(literal(matched, ARRAY(Integer))))
+
+    for facet, ids, mode in filters:
+        if ids:
+            query = query.filter(_facet_clause(facet, ids, mode))
+    return query
+
+
+def _validate_name_match(value: str | None) -> str:
+    mode = (value or "contains").lower()
+    if mode not in {"contains", "fuzzy"}:
+        raise HTTPException(status_code=422, detail="name_match must be one of: contains, fuzzy")
+    return mode
+
+
+def _parse_fuzzy_threshold(value: str | None) -> float:
+    if value is None or value.strip() == "":
+        return FUZZY_THRESHOLD
+    try:
+        threshold = float(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="fuzzy_threshold must be a number")
+    if not 0 <= threshold <= 1:
+        raise HTTPException(status_code=422, detail="fuzzy_threshold must be between 0 and 1")
+    return threshold
+
+
+def _filter_by_name(
+    db: Session,
+    query: Query,
+    name: str,
+    name_match: str = "contains",
+    threshold: float | None = None,
+) -> tuple[Query, ColumnElement | None]:
+    """
+    Apply the name filter according to `name_match`:
+      - 'contains' (default): substring match
+      - 'fuzzy': pg_trgm similarity match, tolerant to typos
+
+    Both compare normalize_name(name) against games.name_normalized, so case, accents and
+    punctuation don't matter ("pokemon" finds "Pokémon"), and are served by the
+    ix_games_name_normalized_trgm GIN index. Returns the filtered query and, for fuzzy
+    matching, the similarity expression to rank results by.
+    """
+    needle = normalize_name(name)
+    if not needle:
+        # Nothing left after folding (e.g. only punctuation): match the raw text instead
+        return query.filter(Game.name.ilike(f"%{name.strip()}%")), None
+    if name_match == "fuzzy":
+        if threshold is None:
+            threshold = FUZZY_THRESHOLD
+        # '%' compares against pg_trgm.similarity_threshold; scope it to this transaction
+        db.execute(select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True)))
+        similarity = func.similarity(Game.name_normalized, needle)
+        return query.filter(Game.name_normalized.op("%")(needle)), similarity
+    # normalized text is [a-z0-9 ] only, so it carries no LIKE wildcards
+    return query.filter(Game.name_normalized.like(f"%{needle}%")), None
+
+
+def _serialize_games(db: Session, games: list[Game], projection: str = "full") -> list:
+    schema = GAME_PROJECTIONS[projection][0]
+    if "location_path" not in schema.model_fields:
+        return [schema.model_validate(g) for g in games]
+
+    # One query resolves every location path on the page
+    attach_location_paths(db, games)
+    return [schema.model_validate(g) for g in games]
+
+
+def _wants_ndjson(request: Request) -> bool:
+    return "application/x-ndjson" in request.headers.get("accept", "")
+
+
+def _stream_ndjson(db: Session, query: Query, projection: str) -> Iterator[str]:
+    """
+    Yield one JSON line per game, fetching STREAM_BATCH_SIZE rows at a time through a
+    server-side cursor. Relationships and location paths are loaded per batch, and
+    batches are dropped once written, so memory stays flat whatever the result size.
+    """
+    batch: list[Game] = []
+    for game in query.yield_per(STREAM_BATCH_SIZE):
+        batch.append(game)
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield "".join(item.model_dump_json() + "\n" for item in _serialize_games(db, batch, projection))
+            batch = []
+    if batch:
+        yield "".join(item.model_dump_json() + "\n" for item in _serialize_games(db, batch, projection))
+
+
+def search_games_basic(request: Request) -> dict:
     qp = request.query_params
     name = qp.get("name")
     year = qp.get("year")
     platform_id = qp.get("platform_id")
     tag_ids = qp.getlist("tag_ids")
     match_mode = _validate_match_mode(qp.get("match_mode"), "match_mode")
+    name_match = _validate_name_match(qp.get("name_match"))
     limit = qp.get("limit")
     offset = qp.get("offset")
+    cursor = qp.get("cursor")
+    count = validate_count_mode(qp.get("count"))
+    sort = validate_sort(qp.get("sort"))
+    projection = validate_projection(qp.get("fields"))
+
+    if limit and not limit.isdigit():
+        raise HTTPException(status_code=422, detail="Limit must be a number")
+    if offset and not offset.isdigit():
+        raise HTTPException(status_code=422, detail="Offset must be a number")
 
     with with_db() as db:
-        query = db.query(Game)
+        query = db.query(Game).options(*GAME_PROJECTIONS[projection][1])
+        similarity = None
 
         if name:
-            query = query.filter(Game.name.ilike(f"%{name.strip().lower()}%"))
+            query, similarity = _filter_by_name(
+                db, query, name, name_match, _parse_fuzzy_threshold(qp.get("fuzzy_threshold"))
+            )
 
         if year:
             if not year.isdigit():
@@ -63,49 +220,182 @@ def search_games_basic(request: Request) -> list[GameSchema]:
         if platform_id:
             if not platform_id.isdigit():
                 raise HTTPException(status_code=422, detail="Platform ID must be numeric")
-            query = query.join(Game.platforms).filter(Platform.id == int(platform_id))
+            query = query.filter(_facet_clause("platforms", [int(platform_id)], "any"))
 
         if tag_ids:
-            tag_ids_int = _parse_int_list(tag_ids)
-            if match_mode == "all":
-                for tid in tag_ids_int:
-                    query = query.filter(Game.tags.any(Tag.id == tid))
-            elif match_mode == "exact":
-                for tid in tag_ids_int:
-                    query = query.filter(Game.tags.any(Tag.id == tid))
-                query = query.filter(~Game.tags.any(~Tag.id.in_(tag_ids_int)))
-            else:  # any
-                query = query.join(Game.tags).filter(Tag.id.in_(tag_ids_int))
-
-        query = query.order_by(func.lower(Game.name))
-
-        if limit:
-            if not limit.isdigit():
-                raise HTTPException(status_code=422, detail="Limit must be a number")
-            query = query.limit(int(limit))
-
-        if offset:
-            if not offset.isdigit():
-                raise HTTPException(status_code=422, detail="Offset must be a number")
-            query = query.offset(int(offset))
-
-        results = query.all()
+            query = _apply_facet_filters(db, query, [("tags", _parse_int_list(tag_ids), match_mode)])
+
+        results, next_cursor, meta = fetch_page(
+            query,
+            sort,
+            cursor,
+            int(limit) if limit else None,
+            int(offset) if offset else None,
+            rank=similarity,
+            count=count,
+        )
+        return {"results": _serialize_games(db, results, projection), "next_cursor": next_cursor, **meta}
+
+
+# q= keys that name a facet value; comma-separated values match any of them
+_QUERY_FACET_KEYS = {
+    "platform": "platforms",
+    "tag": "tags",
+    "genre": "genres",
+    "mode": "modes",
+    "perspective": "perspectives",
+    "company": "companies",
+    "igdb_tag": "igdb_tags",
+}
+_QUERY_KEYS = set(_QUERY_FACET_KEYS) | {"name", "year", "collection", "loc", "location", "manual"}
+
+# [-]key:value, [-]key:"quoted value", or a bare word (part of the name)
+_QUERY_TOKEN = re.compile(r'(-)?(?:([A-Za-z_]+):)?(?:"([^"]*)"?|(\S+))')
+_YEAR_RANGE = re.compile(r"^(\d{4})?\.\.(\d{4})?$")
+
+
+@lru_cache(maxsize=512)
+def _parse_query_language(text: str) -> tuple:
+    """
+    Parse a q= expression such as
+        platform:snes genre:rpg year:1990..1995 tag:boxed -tag:loose loc:"Attic"
+    into (kind, values, negate) terms, ANDed together by _query_term_clause.
+    Parsed forms are cached per distinct q string.
+    """
+    terms: list[tuple] = []
+    words: list[str] = []
+    for match in _QUERY_TOKEN.finditer(text):
+        negate, key, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        if value is None or (not value.strip() and key is None):
+            continue
+        if key is None:
+            if bare and bare.endswith(":") and bare[:-1].lower() in _QUERY_KEYS:
+                raise HTTPException(status_code=422, detail=f"'{bare}' needs a value")
+            if negate:
+                terms.append(("name", (value,), True))
+            else:
+                words.append(value)
+            continue
 
-        payload: list[GameSchema] = []
-        with db:  # ensure same session for location lookups
-            for g in results:
-                item = GameSchema.model_validate(g)
-                raw_path = get_location_path(db, g.id)
-                item.location_path = [LocationPathItem(**p) for p in raw_path]
-                payload.append(item)
-        return payload
+        key = key.lower()
+        if key not in _QUERY_KEYS:
+            raise HTTPException(status_code=422, detail=f"Unknown search key '{key}'")
+        value = value.strip()
+        if not value:
+            raise HTTPException(status_code=422, detail=f"'{key}:' needs a value")
+
+        if key in _QUERY_FACET_KEYS:
+            values = tuple(v.strip() for v in value.split(",") if v.strip())
+            terms.append((_QUERY_FACET_KEYS[key], values, bool(negate)))
+        elif key == "year":
+            if value.isdigit():
+                bounds = (int(value), int(value))
+            elif (m := _YEAR_RANGE.match(value)) and (m.group(1) or m.group(2)):
+                bounds = (int(m.group(1)) if m.group(1) else None, int(m.group(2)) if m.group(2) else None)
+            else:
+                raise HTTPException(status_code=422, detail="year: must be YYYY or YYYY..YYYY")
+            if None not in bounds and bounds[0] > bounds[1]:
+                raise HTTPException(status_code=422, detail="year: range start is after its end")
+            terms.append(("year", bounds, bool(negate)))
+        elif key == "manual":
+            if value.lower() not in {"true", "false", "only"} or negate:
+                raise HTTPException(status_code=422, detail="manual: must be true, false or only")
+            terms.append(("manual", (value.lower(),), False))
+        elif key == "name":
+            terms.append(("name", (value,), bool(negate)))
+        else:
+            kind = "location" if key in {"loc", "location"} else key
+            terms.append((kind, (value,), bool(negate)))
+
+    if words:
+        terms.append(("name", (" ".join(words),), False))
+    return tuple(terms)
+
+
+# q= facet kind -> entity model its values are looked up in
+_QUERY_FACET_MODELS = {
+    "platforms": Platform,
+    "tags": Tag,
+    "genres": Genre,
+    "modes": Mode,
+    "perspectives": PlayerPerspective,
+    "companies": Company,
+    "igdb_tags": IGDBTag,
+}
+
+
+def _folded_name_sql(column: ColumnElement) -> ColumnElement:
+    # SQL twin of normalize_name (minus accent folding) for tables without name_normalized
+    return func.trim(func.regexp_replace(func.replace(func.lower(column), "'", ""), "[^a-z0-9]+", " ", "g"))
+
+
+def _name_match(model, values: tuple) -> ColumnElement:
+    """
+    Rows of `model` named by any of `values`, compared as normalize_name() folds them.
+    Models storing name_normalized (tags, companies, collections) match the whole name.
+    The small IGDB vocabularies (genres, modes, perspectives, IGDB tags, platforms) also
+    match on whole words of the name, so 'rpg' finds "Role-playing (RPG)"; platforms
+    match their slug too (e.g. 'snes').
+    """
+    needles = [n for n in (normalize_name(v) for v in values) if n]
+    if not needles:
+        return false()
+    if hasattr(model, "name_normalized"):
+        return model.name_normalized.in_(needles)
+    padded = literal(" ") + _folded_name_sql(model.name) + literal(" ")
+    clause = or_(*(padded.like(f"% {needle} %") for needle in needles))
+    if model is Platform:
+        clause = clause | func.lower(Platform.slug).in_([v.strip().lower() for v in values])
+    return clause
+
+
+def _query_term_clause(kind: str, values: tuple, negate: bool) -> ColumnElement:
+    """
+    Compile one parsed q= term into a predicate on games. Name lookups are subqueries of
+    the same statement, so the whole expression runs as one SQL query; values are bound
+    parameters, so equal-shaped expressions reuse SQLAlchemy's compiled-statement cache.
+    """
+    if kind in _QUERY_FACET_MODELS:
+        model = _QUERY_FACET_MODELS[kind]
+        ids = select(func.array_agg(model.id)).where(_name_match(model, values)).scalar_subquery()
+        clause = FACET_ARRAYS[kind].overlap(func.coalesce(ids, cast(literal("{}"), ARRAY(Integer))))
+    elif kind == "year":
+        low, high = values
+        clause = and_(
+            Game.release_date >= low if low is not None else true(),
+            Game.release_date <= high if high is not None else true(),
+        )
+        if negate:
+            # NOT of a comparison with NULL is NULL; undated games are outside any range
+            return or_(Game.release_date.is_(None), ~clause)
+    elif kind == "name":
+        needle = normalize_name(values[0])
+        clause = Game.name_normalized.like(f"%{needle}%") if needle else true()
+    elif kind == "manual":
+        clause = {"true": true(), "false": Game.igdb_id != 0, "only": Game.igdb_id == 0}[values[0]]
+    elif kind == "collection":
+        clause = Game.collection_id.in_(select(Collection.id).where(_name_match(Collection, values)))
+    else:
+        # A location matches itself and everything stored beneath it
+        named = select(Location.id).where(func.lower(Location.name).in_([v.lower() for v in values]))
+        clause = Game.location_id.in_(
+            select(location_closure.c.descendant_id).where(location_closure.c.ancestor_id.in_(named))
+        )
 
+    if not negate:
+        return clause
+    if kind in {"collection", "location"}:
+        column = Game.collection_id if kind == "collection" else Game.location_id
+        return or_(column.is_(None), ~clause)
+    return ~clause
 
-def search_games_advanced(request: Request) -> list[GameSchema]:
-    qp = request.query_params
-    if not qp:
-        raise HTTPException(status_code=400, detail="At least one search parameter must be provided")
 
+def _parse_advanced_filters(qp) -> dict:
+    """
+    Validate /search/advanced query params into a plain filter description.
+    Shared by advanced search, facet counts and saved searches so they agree on what matches.
+    """
     # Years
     year = qp.get("year")
     year_min = qp.get("year_min")
@@ -135,8 +425,11 @@ def search_games_advanced(request: Request) -> list[GameSchema]:
     if include_desc not in [None, "true", "false"]:
         raise HTTPException(status_code=422, detail="include_location_descendants must be 'true' or 'false'")
 
+    terms = list(_parse_query_language(qp.get("q").strip())) if qp.get("q") else []
+
     # Presence check
     filter_present = any([
+        terms,
         qp.get("name"),
         year, year_min, year_max,
         qp.get("platform_ids"),
@@ -150,281 +443,371 @@ def search_games_advanced(request: Request) -> list[GameSchema]:
         qp.get("location_id"),
         include_manual
     ])
-    if not filter_present:
-        raise HTTPException(status_code=400, detail="No valid filters provided")
-
-    with with_db() as db:
-        query = db.query(Game)
 
-        # Name
-        if name := qp.get("name"):
-            query = query.filter(Game.name.ilike(f"%{name.strip().lower()}%"))
+    name = qp.get("name")
+    name_match = _validate_name_match(qp.get("name_match"))
+    fuzzy_threshold = _parse_fuzzy_threshold(qp.get("fuzzy_threshold")) if name_match == "fuzzy" else None
+
+    # Collection
+    collection_id = None
+    if (coll := qp.get("collection_id")) and coll.isdigit():
+        collection_id = int(coll)
+
+    # Companies (single & multiple)
+    company_ids: list[int] = []
+    for cid in qp.getlist("company_ids"):
+        if cid and cid.isdigit():
+            company_ids.append(int(cid))
+    for cid in qp.getlist("company_id"):
+        if cid and cid.isdigit():
+            company_ids.append(int(cid))
+    if not company_ids:
+        single = qp.get("company_id")
+        if single and single.isdigit():
+            company_ids.append(int(single))
+
+    # Location
+    location_id = None
+    if loc := qp.get("location_id"):
+        if not loc.isdigit():
+            raise HTTPException(status_code=422, detail="location_id must be a number")
+        location_id = int(loc)
+
+    return {
+        "present": filter_present,
+        "name": name,
+        "name_match": name_match,
+        "fuzzy_threshold": fuzzy_threshold,
+        "year": int(year) if year else None,
+        "year_min": int(year_min) if year_min else None,
+        "year_max": int(year_max) if year_max else None,
+        "facets": [
+            ("platforms", _parse_int_list(qp.getlist("platform_ids")), platform_match_mode),
+            ("tags", _parse_int_list(qp.getlist("tag_ids")), tag_match_mode),
+            ("genres", _parse_int_list(qp.getlist("genre_ids")), genre_match_mode),
+            ("modes", _parse_int_list(qp.getlist("mode_ids")), mode_match_mode),
+            ("perspectives", _parse_int_list(qp.getlist("perspective_ids")), perspective_match_mode),
+            ("companies", company_ids, company_match_mode),
+            ("igdb_tags", _parse_int_list(qp.getlist("igdb_tag_ids")), igdb_match_mode),
+        ],
+        "collection_id": collection_id,
+        "location_id": location_id,
+        "include_location_descendants": include_desc == "true",
+        "include_manual": include_manual,
+        "terms": terms,
+    }
+
+
+def _apply_advanced_filters(
+    db: Session, query: Query, filters: dict, use_facet_index: bool = True
+) -> tuple[Query, ColumnElement | None]:
+    """
+    Apply parsed advanced filters to `query` (any query selecting from games).
+    Returns the filtered query and the fuzzy-name rank, if any.
+    """
+    similarity = None
+
+    # Name (substring or fuzzy)
+    if filters["name"]:
+        query, similarity = _filter_by_name(
+            db, query, filters["name"], filters["name_match"], filters["fuzzy_threshold"]
+        )
 
-        # Year and ranges
-        if year:
+    # Year and ranges
+    year, year_min, year_max = filters["year"], filters["year_min"], filters["year_max"]
+    if year is not None:
+        query = query.filter(
+            Game.release_date >= year,
+            Game.release_date <= year
+        )
+    else:
+        if year_min is not None and year_max is not None:
             query = query.filter(
-                Game.release_date >= int(year),
-                Game.release_date <= int(year)
+                Game.release_date >= year_min,
+                Game.release_date <= year_max
             )
+        elif year_min is not None:
+            query = query.filter(Game.release_date >= year_min)
+        elif year_max is not None:
+            query = query.filter(Game.release_date <= year_max)
+
+    # Collection
+    if filters["collection_id"] is not None:
+        query = query.filter(Game.collection_id == filters["collection_id"])
+
+    # Facets (any/all/exact each)
+    query = _apply_facet_filters(db, query, filters["facets"], use_facet_index)
+
+    # Location (with optional descendants)
+    root = filters["location_id"]
+    if root is not None:
+        if filters["include_location_descendants"]:
+            query = query.filter(Game.location_id.in_(subtree_location_ids(root)))
         else:
-            if year_min and year_max:
-                query = query.filter(
-                    Game.release_date >= int(year_min),
-                    Game.release_date <= int(year_max)
-                )
-            elif year_min:
-                query = query.filter(Game.release_date >= int(year_min))
-            elif year_max:
-                query = query.filter(Game.release_date <= int(year_max))
-
-        # Platforms (any/all/exact)
-        platform_ids = _parse_int_list(qp.getlist("platform_ids"))
-        if platform_ids:
-            if platform_match_mode == "all":
-                for pid in platform_ids:
-                    query = query.filter(Game.platforms.any(Platform.id == pid))
-            elif platform_match_mode == "exact":
-                for pid in platform_ids:
-                    query = query.filter(Game.platforms.any(Platform.id == pid))
-                query = query.filter(~Game.platforms.any(~Platform.id.in_(platform_ids)))
-            else:  # any
-                query = query.filter(Game.platforms.any(Platform.id.in_(platform_ids)))
-
-        # Tags (any/all/exact)
-        tag_ids = _parse_int_list(qp.getlist("tag_ids"))
-        if tag_ids:
-            if tag_match_mode == "all":
-                for tid in tag_ids:
-                    query = query.filter(Game.tags.any(Tag.id == tid))
-            elif tag_match_mode == "exact":
-                for tid in tag_ids:
-                    query = query.filter(Game.tags.any(Tag.id == tid))
-                query = query.filter(~Game.tags.any(~Tag.id.in_(tag_ids)))
-            else:  # any
-                query = query.filter(Game.tags.any(Tag.id.in_(tag_ids)))
-
-        # Genres
-        genre_ids = _parse_int_list(qp.getlist("genre_ids"))
-        if genre_ids:
-            if genre_match_mode == "all":
-                for gid in genre_ids:
-                    query = query.filter(Game.genres.any(Genre.id == gid))
-            elif genre_match_mode == "exact":
-                for gid in genre_ids:
-                    query = query.filter(Game.genres.any(Genre.id == gid))
-                query = query.filter(~Game.genres.any(~Genre.id.in_(genre_ids)))
-            else:  # any
-                query = query.filter(Game.genres.any(Genre.id.in_(genre_ids)))
-
-        # Modes
-        mode_ids = _parse_int_list(qp.getlist("mode_ids"))
-        if mode_ids:
-            if mode_match_mode == "all":
-                for mid in mode_ids:
-                    query = query.filter(Game.modes.any(Mode.id == mid))
-            elif mode_match_mode == "exact":
-                for mid in mode_ids:
-                    query = query.filter(Game.modes.any(Mode.id == mid))
-                query = query.filter(~Game.modes.any(~Mode.id.in_(mode_ids)))
-            else:  # any
-                query = query.filter(Game.modes.any(Mode.id.in_(mode_ids)))
-
-        # Player perspectives
-        perspective_ids = _parse_int_list(qp.getlist("perspective_ids"))
-        if perspective_ids:
-            if perspective_match_mode == "all":
-                for ppid in perspective_ids:
-                    query = query.filter(Game.playerperspectives.any(PlayerPerspective.id == ppid))
-            elif perspective_match_mode == "exact":
-                for ppid in perspective_ids:
-                    query = query.filter(Game.playerperspectives.any(PlayerPerspective.id == ppid))
-                query = query.filter(~Game.playerperspectives.any(~PlayerPerspective.id.in_(perspective_ids)))
-            else:  # any
-                query = query.filter(Game.playerperspectives.any(PlayerPerspective.id.in_(perspective_ids)))
-
-        # Collection
-        if coll := qp.get("collection_id"):
-            if coll.isdigit():
-                query = query.filter(Game.collection_id == int(coll))
-
-        # Companies (multi + any/all/exact)
-        company_ids: list[int] = []
-        for cid in qp.getlist("company_ids"):
-            if cid and cid.isdigit():
-                company_ids.append(int(cid))
-        for cid in qp.getlist("company_id"):
-            if cid and cid.isdigit():
-                company_ids.append(int(cid))
-        if not company_ids:
-            single = qp.get("company_id")
-            if single and single.isdigit():
-                company_ids.append(int(single))
-
-        if company_ids:
-            if company_match_mode == "all":
-                for cid in company_ids:
-                    query = query.filter(Game.companies.any(GameCompany.company_id == cid))
-            elif company_match_mode == "exact":
-                for cid in company_ids:
-                    query = query.filter(Game.companies.any(GameCompany.company_id == cid))
-                query = query.filter(~Game.companies.any(~GameCompany.company_id.in_(company_ids)))
-            else:  # any
-                query = query.filter(Game.companies.any(GameCompany.company_id.in_(company_ids)))
-
-        # IGDB tags (any/all/exact)
-        igdb_ids = _parse_int_list(qp.getlist("igdb_tag_ids"))
-        if igdb_ids:
-            if igdb_match_mode == "all":
-                for itid in igdb_ids:
-                    query = query.filter(Game.igdb_tags.any(IGDBTag.id == itid))
-            elif igdb_match_mode == "exact":
-                for itid in igdb_ids:
-                    query = query.filter(Game.igdb_tags.any(IGDBTag.id == itid))
-                query = query.filter(~Game.igdb_tags.any(~IGDBTag.id.in_(igdb_ids)))
-            else:  # any
-                query = query.filter(Game.igdb_tags.any(IGDBTag.id.in_(igdb_ids)))
-
-        # Location (with optional descendants)
-        if loc := qp.get("location_id"):
-            if not loc.isdigit():
-                raise HTTPException(status_code=422, detail="location_id must be a number")
-            root = int(loc)
-            if include_desc == "true":
-                desc_ids = get_descendant_location_ids_from_snapshot(db, root)
-                ids = [root] + desc_ids if desc_ids else [root]
-                query = query.filter(Game.location_id.in_(ids))
-            else:
-                query = query.filter(Game.location_id == root)
+            query = query.filter(Game.location_id == root)
+
+    # q= expression terms
+    for kind, values, negate in filters["terms"]:
+        query = query.filter(_query_term_clause(kind, values, negate))
 
-        # Manual entries
-        if include_manual == "true":
-            pass
-        elif include_manual == "false":
-            query = query.filter(Game.igdb_id != 0)
-        elif include_manual == "only":
-            query = query.filter(Game.igdb_id == 0)
+    # Manual entries
+    include_manual = filters["include_manual"]
+    if include_manual == "true":
+        pass
+    elif include_manual == "false":
+        query = query.filter(Game.igdb_id != 0)
+    elif include_manual == "only":
+        query = query.filter(Game.igdb_id == 0)
 
-        # ORDER / LIMIT
-        query = query.order_by(func.lower(Game.name))
+    return query, similarity
 
-        lim = qp.get("limit")
-        off = qp.get("offset")
-        if lim and lim.isdigit():
-            query = query.limit(int(lim))
-        if off and off.isdigit():
-            query = query.offset(int(off))
 
-        results = query.all()
+def search_games_advanced(request: Request) -> dict | StreamingResponse:
+    qp = request.query_params
+    if not qp:
+        raise HTTPException(status_code=400, detail="At least one search parameter must be provided")
+
+    filters = _parse_advanced_filters(qp)
+    if not filters["present"]:
+        raise HTTPException(status_code=400, detail="No valid filters provided")
 
-        payload: list[GameSchema] = []
-        for g in results:
-            item = GameSchema.model_validate(g)
-            raw_path = get_location_path(db, g.id)
-            item.location_path = [LocationPathItem(**p) for p in raw_path]
-            payload.append(item)
-        return payload
+    cursor = qp.get("cursor")
+    lim = qp.get("limit")
+    off = qp.get("offset")
+    limit = int(lim) if lim and lim.isdigit() else None
+    offset = int(off) if off and off.isdigit() else None
+    count = validate_count_mode(qp.get("count"))
+    sort = validate_sort(qp.get("sort"))
+    projection = validate_projection(qp.get("fields"))
 
+    if _wants_ndjson(request):
+        return _stream_games_advanced(filters, cursor, limit, offset, projection, sort)
 
-def search_game_name_suggestions(request: Request) -> list[str]:
-    query_text = request.query_params.get("q", "").strip()
-    if len(query_text) < 2:
-        raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
     with with_db() as db:
-        results = (
-            db.query(Game.name)
-            .filter(Game.name.ilike(f"%{query_text}%"))
-            .order_by(func.lower(Game.name))
-            .limit(10)
+        generation = get_search_generation(db)
+        cache_key = canonical_key("advanced", filters, cursor, limit, offset, count, projection, list(sort))
+        cached = search_result_cache.get(generation, cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        query, similarity = _apply_advanced_filters(
+            db, db.query(Game).options(*GAME_PROJECTIONS[projection][1]), filters
+        )
+
+        # ORDER / LIMIT (keyset via cursor, or offset)
+        results, next_cursor, meta = fetch_page(
+            query, sort, cursor, limit, offset, rank=similarity, count=count
+        )
+        response = {"results": _serialize_games(db, results, projection), "next_cursor": next_cursor, **meta}
+        search_result_cache.put(generation, cache_key, response)
+        return dict(response)
+
+
+def _stream_games_advanced(
+    filters: dict,
+    cursor: str | None,
+    limit: int | None,
+    offset: int | None,
+    projection: str,
+    sort: tuple[str, bool] = ("name", False),
+) -> StreamingResponse:
+    """
+    Accept: application/x-ndjson variant of advanced search: the same filters, order and
+    paging, written out one game per line as rows arrive instead of as one JSON document.
+    Not cached; there is no page to cache.
+    """
+    # Reject bad paging before the response starts; errors can't be reported mid-stream
+    if cursor and offset:
+        raise HTTPException(status_code=422, detail="cursor and offset cannot be combined")
+    if cursor:
+        if filters["name"] and filters["name_match"] == "fuzzy":
+            raise HTTPException(status_code=422, detail="cursor is not supported with name_match=fuzzy")
+        decode_cursor(cursor, sort)
+
+    def lines() -> Iterator[str]:
+        with with_db() as db:
+            query, similarity = _apply_advanced_filters(
+                db, db.query(Game).options(*GAME_PROJECTIONS[projection][1]), filters
+            )
+            query = order_query(query, sort, cursor, offset, rank=similarity)
+            if limit is not None:
+                query = query.limit(limit)
+            yield from _stream_ndjson(db, query, projection)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# facet name -> entity model whose id/name label the counts
+_FACET_COUNT_MODELS = {
+    "platforms": Platform,
+    "genres": Genre,
+    "modes": Mode,
+    "perspectives": PlayerPerspective,
+    "tags": Tag,
+    "companies": Company,
+}
+
+
+def search_games_facets(request: Request) -> dict:
+    """
+    Count games per facet value over the advanced-search result set (same params as /search/advanced).
+    The filtered game IDs are computed once as a subquery; each facet is then one GROUP BY pass.
+    """
+    filters = _parse_advanced_filters(request.query_params)
+
+    with with_db() as db:
+        generation = get_search_generation(db)
+        cache_key = canonical_key("facets", filters)
+        cached = search_result_cache.get(generation, cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        matching, _ = _apply_advanced_filters(db, db.query(Game.id.label("id")), filters)
+        matching = matching.subquery()
+
+        facets: dict[str, list[dict]] = {}
+        for facet, model in _FACET_COUNT_MODELS.items():
+            game_col, value_col = FACET_SOURCES[facet]
+            count = func.count(game_col)
+            rows = (
+                db.query(model.id, model.name, count)
+                .join(value_col.table, value_col == model.id)
+                .join(matching, matching.c.id == game_col)
+                .group_by(model.id, model.name)
+                .order_by(count.desc(), model.name.asc())
+                .all()
+            )
+            facets[facet] = [{"id": vid, "name": name, "count": n} for vid, name, n in rows]
+
+        decade = ((Game.release_date // 10) * 10).label("decade")
+        decade_rows = (
+            db.query(decade, func.count(Game.id))
+            .join(matching, matching.c.id == Game.id)
+            .filter(Game.release_date.isnot(None))
+            .group_by(decade)
+            .order_by(decade.asc())
             .all()
         )
-        return [r[0] for r in results]
+        facets["decades"] = [{"decade": d, "count": n} for d, n in decade_rows]
 
+        total = db.query(func.count()).select_from(matching).scalar()
+        response = {"total": total, "facets": facets}
+        search_result_cache.put(generation, cache_key, response)
+        return dict(response)
 
-def search_tag_suggestions(request: Request) -> list[dict]:
+
+def get_search_cache_stats() -> dict:
+    return search_result_cache.stats()
+
+
+def search_games_fulltext(request: Request) -> list:
+    """
+    Full-text search over name, summary, collection and company names using the
+    GIN-indexed games.search_vector. Results are ordered by ts_rank (best first).
+    Accepts web-search syntax: quoted phrases, OR, and -exclusions.
+    """
+    qp = request.query_params
+    text = (qp.get("q") or "").strip()
+    if len(text) < 2:
+        raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
+
+    limit = qp.get("limit")
+    offset = qp.get("offset")
+    if limit and not limit.isdigit():
+        raise HTTPException(status_code=422, detail="Limit must be a number")
+    if offset and not offset.isdigit():
+        raise HTTPException(status_code=422, detail="Offset must be a number")
+    projection = validate_projection(qp.get("fields"))
+
+    with with_db() as db:
+        ts_query = func.websearch_to_tsquery(FTS_CONFIG, text)
+        rank = func.ts_rank(Game.search_vector, ts_query)
+
+        query = (
+            db.query(Game)
+            .options(*GAME_PROJECTIONS[projection][1])
+            .filter(Game.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Game.sort_key, Game.id)
+        )
+        if limit:
+            query = query.limit(int(limit))
+        if offset:
+            query = query.offset(int(offset))
+
+        return _serialize_games(db, query.all(), projection)
+
+
+def _suggest_query(request: Request) -> str:
     query_text = request.query_params.get("q", "").strip()
     if len(query_text) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
+    return query_text
+
+
+def _suggest_entities(request: Request, entity: str) -> list[dict]:
+    """
+    Served from the in-memory autocomplete index (utils.suggest_index); the DB is
+    only read when the index is first built or after a row of that entity was added,
+    removed or renamed.
+    """
+    query_text = _suggest_query(request)
     with with_db() as db:
-        rows = (
-            db.query(Tag)
-            .filter(Tag.name.ilike(f"%{query_text}%"))
-            .order_by(func.lower(Tag.name))
-            .limit(10)
-            .all()
-        )
-        return [{"id": t.id, "name": t.name} for t in rows]
+        return [{"id": row_id, "name": name} for row_id, name in suggest(db, entity, query_text)]
 
 
-def search_igdb_tag_suggestions(request: Request) -> list[dict]:
-    q = request.query_params.get("q", "").strip()
-    if len(q) < 2:
-        raise HTTPException(400, "Query must be at least 2 characters")
+def search_game_name_suggestions(request: Request) -> list[str]:
+    query_text = _suggest_query(request)
     with with_db() as db:
-        results = (
-            db.query(IGDBTag)
-            .filter(IGDBTag.name.ilike(f"%{q}%"))
-            .order_by(func.lower(IGDBTag.name))
-            .limit(10)
-            .all()
-        )
-        return [{"id": r.id, "name": r.name} for r in results]
+        return [name for _, name in suggest(db, "names", query_text)]
+
+
+def search_tag_suggestions(request: Request) -> list[dict]:
+    return _suggest_entities(request, "tags")
+
+
+def search_igdb_tag_suggestions(request: Request) -> list[dict]:
+    return _suggest_entities(request, "igdb_tags")
 
 
 def search_genre_suggestions(request: Request) -> list[dict]:
-    q = request.query_params.get("q", "").strip()
-    if len(q) < 2:
-        raise HTTPException(400, "Query must be at least 2 characters")
-    with with_db() as db:
-        results = (
-            db.query(Genre)
-            .filter(Genre.name.ilike(f"%{q}%"))
-            .order_by(func.lower(Genre.name))
-            .limit(10)
-            .all()
-        )
-        return [{"id": r.id, "name": r.name} for r in results]
+    return _suggest_entities(request, "genres")
 
 
 def search_mode_suggestions(request: Request) -> list[dict]:
-    q = request.query_params.get("q", "").strip()
-    if len(q) < 2:
-        raise HTTPException(400, "Query must be at least 2 characters")
-    with with_db() as db:
-        results = (
-            db.query(Mode)
-            .filter(Mode.name.ilike(f"%{q}%"))
-            .order_by(func.lower(Mode.name))
-            .limit(10)
-            .all()
-        )
-        return [{"id": r.id, "name": r.name} for r in results]
+    return _suggest_entities(request, "modes")
 
 
 def search_collection_suggestions(request: Request) -> list[dict]:
-    q = request.query_params.get("q", "").strip()
-    if len(q) < 2:
-        raise HTTPException(400, "Query must be at least 2 characters")
-    with with_db() as db:
-        results = (
-            db.query(Collection)
-            .filter(Collection.name.ilike(f"%{q}%"))
-            .order_by(func.lower(Collection.name))
-            .limit(10)
-            .all()
-        )
-        return [{"id": r.id, "name": r.name} for r in results]
+    return _suggest_entities(request, "collections")
 
 
 def search_company_suggestions(request: Request) -> list[dict]:
-    q = request.query_params.get("q", "").strip()
-    if len(q) < 2:
-        raise HTTPException(400, "Query must be at least 2 characters")
-    with with_db() as db:
-        results = (
-            db.query(Company)
-            .filter(Company.name.ilike(f"%{q}%"))
-            .order_by(func.lower(Company.name))
-            .limit(10)
-            .all()
+    return _suggest_entities(request, "companies")
+
+
+def search_all_suggestions(request: Request) -> dict:
+    """
+    Suggestions for one search box across every entity type, grouped by type
+    (names, tags, igdb_tags, genres, modes, collections, companies), each group ranked
+    like the per-type endpoints. `types` narrows the groups, `limit` caps each group.
+    """
+    query_text = _suggest_query(request)
+    qp = request.query_params
+
+    types = [t for t in qp.getlist("types") if t] or list(SUGGEST_SOURCES)
+    unknown = [t for t in types if t not in SUGGEST_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"types must be any of: {', '.join(SUGGEST_SOURCES)}",
         )
-        return [{"id": r.id, "name": r.name} for r in results]
+
+    limit = qp.get("limit", "10")
+    if not limit.isdigit() or not 1 <= int(limit) <= 50:
+        raise HTTPException(status_code=422, detail="limit must be between 1 and 50")
+
+    with with_db() as db:
+        return {
+            entity: [{"id": row_id, "name": name} for row_id, name in suggest(db, entity, query_text, int(limit))]
+            for entity in types
+        }
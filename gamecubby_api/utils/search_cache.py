@@ -0,0 +1,88 @@
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+# Max cached result pages per worker; 0 disables the cache.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+
+
+def canonical_key(*parts: Any) -> str:
+    """
+    Stable string for a parsed search request: dict keys sorted, ID lists
+    de-duplicated and sorted, so equivalent query strings share one entry.
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple, set)):
+            items = [normalize(v) for v in value]
+            if items and all(isinstance(v, int) for v in items):
+                return sorted(set(items))
+            return items
+        return value
+
+    return json.dumps([normalize(p) for p in parts], sort_keys=True, separators=(",", ":"))
+
+
+class SearchResultCache:
+    """
+    LRU of search responses, valid for a single search generation.
+    Looking up with a newer generation than the one the entries were stored
+    under drops everything first, so a write anywhere invalidates all pages.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def _sync_generation(self, generation: int) -> None:
+        if self.generation != generation:
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, generation: int, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._sync_generation(generation)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, generation: int, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._sync_generation(generation)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation = None
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "generation": self.generation,
+            }
+
+
+search_result_cache = SearchResultCache(SEARCH_CACHE_SIZE)
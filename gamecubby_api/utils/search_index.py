@@ -0,0 +1,310 @@
+import os
+import re
+from collections import OrderedDict
+from threading import RLock
+from typing import FrozenSet, Iterable, Optional
+
+from sqlalchemy import (
+    select, update, func, event, cast, inspect, literal, text, bindparam, Integer,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, ARRAY
+from sqlalchemy.orm import Session
+from unidecode import unidecode
+
+from ..db import SessionLocal
+from ..models.game import Game
+from ..models.collection import Collection
+from ..models.company import Company
+from ..models.game_company import GameCompany
+from ..models.game_genre import game_genres
+from ..models.game_mode import game_modes
+from ..models.game_platform import game_platforms
+from ..models.game_playerperspective import game_playerperspectives
+from ..models.game_tag import game_tags
+from ..models.igdb_tag import game_igdb_tags
+from ..models.tag import Tag
+from .version_counter import VersionCounter
+
+# Text search configuration used for games.search_vector and /search/fulltext
+FTS_CONFIG = "english"
+
+# facet name -> (game id column, value id column) of its association table
+FACET_SOURCES = {
+    "platforms": (game_platforms.c.game_id, game_platforms.c.platform_id),
+    "tags": (game_tags.c.game_id, game_tags.c.tag_id),
+    "genres": (game_genres.c.game_id, game_genres.c.genre_id),
+    "modes": (game_modes.c.game_id, game_modes.c.mode_id),
+    "perspectives": (game_playerperspectives.c.game_id, game_playerperspectives.c.perspective_id),
+    "companies": (GameCompany.__table__.c.game_id, GameCompany.__table__.c.company_id),
+    "igdb_tags": (game_igdb_tags.c.game_id, game_igdb_tags.c.igdb_tag_id),
+}
+
+# facet name -> denormalized int[] copy of that association on games
+FACET_ARRAYS = {
+    "platforms": Game.platform_ids,
+    "tags": Game.tag_ids,
+    "genres": Game.genre_ids,
+    "modes": Game.mode_ids,
+    "perspectives": Game.perspective_ids,
+    "companies": Game.company_ids,
+    "igdb_tags": Game.igdb_tag_ids,
+}
+
+# Bumped by every write that can change search results; per-worker search caches are
+# keyed on it (see utils.version_counter).
+search_generation = VersionCounter(
+    "search_generation",
+    ttl=float(os.getenv("SEARCH_GENERATION_TTL", "1.0")),
+    flag="search_generation_bumped",
+)
+
+# Bumped only by writes that change a game's facet links (sync_game_search_fields,
+# game deletion), once per transaction; the facet index (utils.facet_index) is keyed on
+# it so vocabulary, location or condition edits don't throw the bitmaps away.
+facet_version = VersionCounter(
+    "facet_version",
+    ttl=float(os.getenv("SEARCH_GENERATION_TTL", "1.0")),
+    flag="facet_version_bumped",
+)
+
+# facet_version -> game IDs whose links that version changed (None = any game), for the
+# versions this process committed itself; lets the facet index patch instead of rebuild.
+_FACET_CHANGES_KEPT = 64
+_facet_changes_lock = RLock()
+_facet_changes: "OrderedDict[int, Optional[FrozenSet[int]]]" = OrderedDict()
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """
+    Accent-, case- and punctuation-folded form of a name, stored in the name_normalized
+    columns and applied to search input: "Pokémon: Let's Go!" -> "pokemon lets go",
+    "final-fantasy-VII" -> "final fantasy vii".
+    """
+    folded = unidecode(text or "").lower().replace("'", "")
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+
+_LEADING_ARTICLE = re.compile(r"^(the|a|an) (?=.)")
+_DIGITS = re.compile(r"\d+")
+
+
+def game_sort_key(name: Optional[str]) -> str:
+    """
+    Natural sort key for games.sort_key: the normalized name without a leading article,
+    with every number zero-padded so "final fantasy 9" < "final fantasy 10" and
+    "The Legend of Zelda" sorts under L.
+    """
+    key = _LEADING_ARTICLE.sub("", normalize_name(name))
+    return _DIGITS.sub(lambda m: m.group().zfill(10), key)
+
+
+def _set_name_normalized(mapper, connection, target) -> None:
+    if inspect(target).attrs.name.history.has_changes():
+        target.name_normalized = normalize_name(target.name)
+        if isinstance(target, Game):
+            target.sort_key = game_sort_key(target.name)
+
+
+# Every ORM insert/update of these rows keeps name_normalized (and games.sort_key) in step with name
+for _model in (Game, Company, Collection, Tag):
+    event.listen(_model, "before_insert", _set_name_normalized)
+    event.listen(_model, "before_update", _set_name_normalized)
+
+
+_LOCATION_PATHS_SQL = text(
+    """
+    SELECT c.descendant_id, l.name
+    FROM location_closure c JOIN locations l ON l.id = c.ancestor_id
+    WHERE c.descendant_id = ANY(:ids)
+    ORDER BY c.descendant_id, c.depth DESC
+    """
+)
+
+
+def location_keys(connection, location_ids: Iterable[int]) -> dict[int, str]:
+    """
+    games.location_key for each location: its root-to-node path of normalized names,
+    joined so a location sorts right before everything stored beneath it.
+    """
+    ids = sorted({int(lid) for lid in location_ids if lid})
+    if not ids:
+        return {}
+    names: dict[int, list[str]] = {lid: [] for lid in ids}
+    for start_id, name in connection.execute(_LOCATION_PATHS_SQL, {"ids": ids}):
+        names[start_id].append(normalize_name(name))
+    return {lid: " / ".join(parts) for lid, parts in names.items()}
+
+
+def _set_location_key(mapper, connection, target) -> None:
+    if inspect(target).attrs.location_id.history.has_changes():
+        target.location_key = location_keys(connection, [target.location_id]).get(target.location_id, "")
+
+
+event.listen(Game, "before_insert", _set_location_key)
+event.listen(Game, "before_update", _set_location_key)
+
+
+def sync_location_keys(session: Session, location_ids: Iterable[int]) -> None:
+    """
+    Rewrite games.location_key for every game stored at `location_ids`. Call after
+    location renames/moves (pass the whole affected subtree) and bulk game moves,
+    which the mapper events don't see.
+    """
+    keys = location_keys(session.connection(), location_ids)
+    if keys:
+        session.execute(
+            update(Game.__table__)
+            .where(Game.__table__.c.location_id == bindparam("lid"))
+            .values(location_key=bindparam("key")),
+            [{"lid": lid, "key": key} for lid, key in keys.items()],
+        )
+
+
+def _search_vector_expr():
+    """
+    Weighted tsvector for a game row: name (A), collection + company names (B), summary (C).
+    Correlated on `games`, so it can be used directly in an UPDATE ... SET.
+    """
+    collection_name = (
+        select(Collection.name)
+        .where(Collection.id == Game.collection_id)
+        .scalar_subquery()
+    )
+    company_names = (
+        select(func.string_agg(Company.name, " "))
+        .select_from(GameCompany)
+        .join(Company, Company.id == GameCompany.company_id)
+        .where(GameCompany.game_id == Game.id)
+        .scalar_subquery()
+    )
+
+    def weighted(text, weight: str):
+        return func.setweight(func.to_tsvector(FTS_CONFIG, func.coalesce(text, "")), weight)
+
+    return (
+        weighted(Game.name, "A")
+        .op("||")(weighted(collection_name, "B"))
+        .op("||")(weighted(company_names, "B"))
+        .op("||")(weighted(Game.summary, "C"))
+    )
+
+
+def _facet_array_values() -> dict:
+    """
+    Sorted value IDs per facet column (empty array when none), correlated on `games`.
+    """
+    values = {}
+    for facet, (game_col, value_col) in FACET_SOURCES.items():
+        ids = (
+            select(func.array_agg(aggregate_order_by(value_col, value_col)))
+            .where(game_col == Game.id)
+            .scalar_subquery()
+        )
+        values[FACET_ARRAYS[facet].key] = func.coalesce(ids, cast(literal("{}"), ARRAY(Integer)))
+    return values
+
+
+def sync_game_search_fields(session: Session, game_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute the denormalized search columns (search_vector and the facet ID arrays)
+    for the given games (all games if None) and bump the search generation.
+    Call after the game's row and associations are flushed and before committing,
+    so the update lands in the same transaction as the write.
+    """
+    stmt = update(Game).values(search_vector=_search_vector_expr(), **_facet_array_values())
+    ids = None
+    if game_ids is not None:
+        ids = [int(gid) for gid in game_ids if gid]
+        if not ids:
+            return
+        stmt = stmt.where(Game.id.in_(ids))
+    session.execute(stmt.execution_options(synchronize_session=False))
+    record_facet_changes(session, ids)
+    bump_search_generation(session, ids)
+
+
+def record_facet_changes(session: Session, game_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Note that the given games' facet links (all games if None) change in this
+    transaction; facet_version is bumped once for all of them when it commits.
+    """
+    if game_ids is None:
+        session.info["facet_changed_all"] = True
+    else:
+        session.info.setdefault("facet_changed_game_ids", set()).update(int(gid) for gid in game_ids)
+
+
+def get_facet_version(session: Session, fresh: bool = False) -> int:
+    return facet_version.get(session, fresh)
+
+
+def facet_changes_since(version: int, target: int) -> Optional[FrozenSet[int]]:
+    """
+    Game IDs whose facet links changed between `version` (exclusive) and `target`, or None
+    when some version in between changed every game or was committed by another process.
+    """
+    changed: set = set()
+    with _facet_changes_lock:
+        for v in range(version + 1, target + 1):
+            if v not in _facet_changes or _facet_changes[v] is None:
+                return None
+            changed |= _facet_changes[v]
+    return frozenset(changed)
+
+
+def bump_search_generation(session: Session, game_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Increment the search generation inside the caller's transaction. Use directly for
+    writes that affect search results without touching a game's own columns
+    (deletes, tag removal, location changes, ...).
+
+    `game_ids` names the only games the write can have moved in or out of a result set;
+    saved searches then re-check just those on their next view (utils.saved_search).
+    Without it every saved search is recomputed on its next view.
+    """
+    if game_ids is None:
+        session.info["search_changed_all"] = True
+    else:
+        session.info.setdefault("search_changed_game_ids", set()).update(int(gid) for gid in game_ids)
+
+    search_generation.bump(session)
+
+
+def get_search_generation(session: Session, fresh: bool = False) -> int:
+    """
+    Current search generation, re-read from the DB at most every SEARCH_GENERATION_TTL
+    seconds (right after this process commits a bump, or always when `fresh`).
+    """
+    return search_generation.get(session, fresh)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _bump_facet_version(session: Session) -> None:
+    changed_all = session.info.pop("facet_changed_all", False)
+    changed = session.info.pop("facet_changed_game_ids", None)
+    if changed_all or changed:
+        version = facet_version.bump(session)
+        session.info["facet_commit"] = (version, None if changed_all else frozenset(changed))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_facet_changes(session: Session) -> None:
+    commit = session.info.pop("facet_commit", None)
+    if commit is None:
+        return
+    version, changed = commit
+    with _facet_changes_lock:
+        _facet_changes[version] = changed
+        while len(_facet_changes) > _FACET_CHANGES_KEPT:
+            _facet_changes.popitem(last=False)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changed_games(session: Session) -> None:
+    session.info.pop("search_changed_all", None)
+    session.info.pop("search_changed_game_ids", None)
+    session.info.pop("facet_changed_all", None)
+    session.info.pop("facet_changed_game_ids", None)
+    session.info.pop("facet_commit", None)
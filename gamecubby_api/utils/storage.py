@@ -6,8 +6,7 @@ import sqlalchemy.exc
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException
 from fastapi.responses import FileResponse
-from shutil import rmtree
-import aiofiles
+from shutil import rmtree, copyfileobj
 
 from ..models.game import Game
 from ..models.storage import GameFile, FileCategory
@@ -58,7 +57,7 @@ def _create_single_game_folders(db: Session, game: Game) -> str:
     return str(base_path)
 
 
-async def upload_and_register_file(
+def upload_and_register_file(
         db: Session,
         game: Game,
         upload_file: UploadFile,
@@ -91,9 +90,9 @@ async def upload_and_register_file(
     try:
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        async with aiofiles.open(dest_path, "wb") as buffer:
-            while chunk := await upload_file.read(8192):
-                await buffer.write(chunk)
+        # UploadFile.file is the spooled temp file behind the request body
+        with open(dest_path, "wb") as buffer:
+            copyfileobj(upload_file.file, buffer, 8192)
 
         file_record = GameFile(
             game=game_ref,
@@ -121,7 +120,7 @@ async def upload_and_register_file(
         raise HTTPException(500, f"File upload failed: {str(e)}") from e
 
 
-async def delete_game_file(
+def delete_game_file(
         db: Session,
         file_id: int,
 ) -> None:
@@ -142,7 +141,7 @@ async def delete_game_file(
         raise HTTPException(500, f"Deletion failed: {str(e)}") from e
 
 
-async def update_file_label(
+def update_file_label(
         db: Session,
         file_id: int,
         game_ref: str,
@@ -0,0 +1,164 @@
+import os
+from bisect import bisect_left
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import event, inspect, select, literal
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+
+from ..models.game import Game
+from ..models.tag import Tag
+from ..models.igdb_tag import IGDBTag
+from ..models.genre import Genre
+from ..models.mode import Mode
+from ..models.collection import Collection
+from ..models.company import Company
+from .search_index import normalize_name
+from .version_counter import VersionCounter
+
+# entity -> model with (id, name) served by /search/suggest/*
+SUGGEST_SOURCES = {
+    "names": Game,
+    "tags": Tag,
+    "igdb_tags": IGDBTag,
+    "genres": Genre,
+    "modes": Mode,
+    "collections": Collection,
+    "companies": Company,
+}
+
+# Infix matching uses trigram postings; 2-character queries use bigrams.
+NGRAM_SIZES = (2, 3)
+
+# One version per entity, bumped only when a row of its own table is inserted, deleted
+# or renamed, so e.g. a game edit doesn't reload the companies or IGDB tags.
+suggest_versions = {
+    entity: VersionCounter(
+        f"suggest_version_{entity}",
+        ttl=float(os.getenv("SEARCH_GENERATION_TTL", "1.0")),
+        flag=f"suggest_version_{entity}_bumped",
+    )
+    for entity in SUGGEST_SOURCES
+}
+_ENTITY_BY_MODEL = {model: entity for entity, model in SUGGEST_SOURCES.items()}
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SuggestIndex:
+    """
+    Autocomplete index for one entity type, built from (id, name, normalized name) rows:
+      - keys/entries: normalized names sorted ascending, so a prefix match is one
+        contiguous bisect range
+      - grams[g]: positions of entries whose name contains the n-gram g, for infix matches
+    """
+
+    def __init__(self, version: int, rows: List[Tuple[int, str, str | None]]):
+        self.version = version
+        entries = sorted(
+            ((key if key is not None else normalize_name(name), name, row_id)
+             for row_id, name, key in rows if name),
+            key=lambda e: (e[0], e[2]),
+        )
+        self.keys: List[str] = [e[0] for e in entries]
+        self.entries: List[Tuple[int, str]] = [(e[2], e[1]) for e in entries]
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+        for pos, key in enumerate(self.keys):
+            for n in NGRAM_SIZES:
+                for gram in _ngrams(key, n):
+                    self.grams[gram].append(pos)
+
+    def _prefix_positions(self, needle: str, limit: int) -> List[int]:
+        start = bisect_left(self.keys, needle)
+        out: List[int] = []
+        for pos in range(start, len(self.keys)):
+            if len(out) >= limit or not self.keys[pos].startswith(needle):
+                break
+            out.append(pos)
+        return out
+
+    def _infix_candidates(self, needle: str) -> List[int]:
+        n = min(len(needle), max(NGRAM_SIZES))
+        postings = sorted((self.grams.get(g, []) for g in _ngrams(needle, n)), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        Entries whose name contains `query` (ignoring case, accents and punctuation):
+        prefix matches first, then the remaining substring matches, each group alphabetical.
+        """
+        needle = normalize_name(query)
+        if not needle:
+            return []
+
+        positions = self._prefix_positions(needle, limit)
+        if len(positions) < limit:
+            taken = set(positions)
+            for pos in self._infix_candidates(needle):
+                if pos in taken or needle not in self.keys[pos]:
+                    continue
+                positions.append(pos)
+                if len(positions) >= limit:
+                    break
+        return [self.entries[pos] for pos in positions]
+
+
+_index_lock = RLock()
+_indexes: Dict[str, SuggestIndex] = {}
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _bump_suggest_versions(session: Session, flush_context) -> None:
+    # new/dirty/deleted and attribute history still describe what was just flushed
+    touched = set()
+    for obj in list(session.new) + list(session.deleted):
+        touched.add(_ENTITY_BY_MODEL.get(type(obj)))
+    for obj in session.dirty:
+        entity = _ENTITY_BY_MODEL.get(type(obj))
+        if entity is not None and inspect(obj).attrs.name.history.has_changes():
+            touched.add(entity)
+    touched.discard(None)
+
+    for entity in touched:
+        counter = suggest_versions[entity]
+        if not session.info.get(counter.flag):  # once per transaction is enough
+            counter.bump(session)
+
+
+def get_suggest_index(session: Session, entity: str) -> SuggestIndex:
+    """
+    Return this worker's index for `entity`, (re)loading it on first use and whenever
+    that entity's suggest version has moved since it was built.
+    """
+    version = suggest_versions[entity].get(session)
+    current = _indexes.get(entity)
+    if current is not None and current.version == version:
+        return current
+
+    with _index_lock:
+        current = _indexes.get(entity)
+        if current is None or current.version != version:
+            model = SUGGEST_SOURCES[entity]
+            # Games, tags, collections and companies store their folded name; fold the rest here
+            key = getattr(model, "name_normalized", None)
+            rows = session.execute(select(model.id, model.name, key if key is not None else literal(None))).all()
+            current = SuggestIndex(version, rows)
+            _indexes[entity] = current
+        return current
+
+
+def suggest(session: Session, entity: str, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+    return get_suggest_index(session, entity).search(query, limit)
+
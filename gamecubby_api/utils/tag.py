@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from ..models.tag import Tag
+from ..models.game_tag import game_tags
+from .search_index import bump_search_generation, sync_game_search_fields
 
 
 def upsert_tag(session: Session, tag_name: str) -> Tag:
@@ -14,6 +16,7 @@ def upsert_tag(session: Session, tag_name: str) -> Tag:
     if not tag:
         tag = Tag(name=tag_name)
         session.add(tag)
+        bump_search_generation(session, [])
         session.commit()
         session.refresh(tag)
     return tag
@@ -41,5 +44,10 @@ def delete_tag(session: Session, tag_id: int) -> None:
     Delete a tag by ID or raise 404.
     """
     tag = get_tag(session, tag_id)
+    game_ids = [gid for (gid,) in session.query(game_tags.c.game_id).filter(game_tags.c.tag_id == tag_id)]
     session.delete(tag)
+    session.flush()
+    # the deleted links leave those games' tag_ids (and saved search results)
+    sync_game_search_fields(session, game_ids)
+    bump_search_generation(session, [])
     session.commit()
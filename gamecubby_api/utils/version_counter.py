@@ -0,0 +1,88 @@
+import time
+from threading import RLock
+from typing import List
+
+from sqlalchemy import BigInteger, String, cast, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models.app_config import AppConfig
+
+_counters: List["VersionCounter"] = []
+
+
+class VersionCounter:
+    """
+    Integer app_config row that writes bump inside their own transaction and every uvicorn
+    worker reads through a short cache. In-process structures remember the value they were
+    built at and rebuild lazily once it moves, which keeps all workers coherent.
+
+      - key:  app_config key holding the value
+      - ttl:  seconds a worker trusts its last read before asking the DB again; commits
+              made by this process invalidate it immediately, other workers' within the TTL
+      - flag: session.info key marking a session that bumped it and hasn't committed yet
+    """
+
+    def __init__(self, key: str, ttl: float, flag: str):
+        self.key = key
+        self.ttl = ttl
+        self.flag = flag
+        self._lock = RLock()
+        # "invalidations" counts this process's own commits of a bump; a DB read that
+        # started before one must not be cached, or it would outlive the write it predates.
+        self._state = {"value": None, "ts": 0.0, "invalidations": 0}
+        _counters.append(self)
+
+    def bump(self, session: Session) -> int:
+        """Increment the value inside the caller's transaction and return the new value."""
+        stmt = insert(AppConfig).values(key=self.key, value="1")
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AppConfig.key],
+            set_={"value": cast(cast(AppConfig.value, BigInteger) + 1, String)},
+        ).returning(AppConfig.value)
+        value = session.connection().execute(stmt).scalar_one()
+        session.info[self.flag] = True
+        return int(value)
+
+    def get(self, session: Session, fresh: bool = False) -> int:
+        """
+        Current value: cached for up to `ttl` seconds, or read from the DB when `fresh`
+        (for answers that must not lag other workers' commits, e.g. 304 responses).
+        """
+        now = time.monotonic()
+        with self._lock:
+            value = self._state["value"]
+            seen = self._state["invalidations"]
+            if not fresh and value is not None and now - self._state["ts"] < self.ttl:
+                return value
+
+        raw = session.query(AppConfig.value).filter(AppConfig.key == self.key).scalar()
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            value = 0
+
+        with self._lock:
+            if self._state["invalidations"] == seen:
+                self._state["value"] = value
+                self._state["ts"] = now
+        return value
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._state["value"] = None
+            self._state["invalidations"] += 1
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _forget_bumped_versions(session: Session) -> None:
+    for counter in _counters:
+        if session.info.pop(counter.flag, False):
+            counter._invalidate()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_version_bumps(session: Session) -> None:
+    for counter in _counters:
+        session.info.pop(counter.flag, None)
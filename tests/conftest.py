@@ -45,6 +45,27 @@ def get_authenticated_client() -> TestClient:
     return client
 
 
+def create_game(client: TestClient, name: str, **extra) -> dict:
+    """
+    POST a manual game named `name` (1995, no location) with `extra` fields overriding
+    the defaults, and return the created game.
+    """
+    payload = {
+        "name": name,
+        "summary": None,
+        "release_date": 1995,
+        "condition": 1,
+        "location_id": None,
+        "order": 1,
+        "collection_id": None,
+        "cover_url": None,
+    }
+    payload.update(extra)
+    resp = client.post("/games/", json=payload)
+    assert resp.status_code == 200
+    return resp.json()
+
+
 @pytest.fixture(scope="module")
 def client():
     return get_authenticated_client()
@@ -0,0 +1,80 @@
+import asyncio
+import inspect
+import time
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from gamecubby_api.db import engine
+from gamecubby_api.main import app
+
+# Simulated per-statement DB latency and the longest event-loop stall we tolerate
+DB_DELAY = 0.2
+MAX_LOOP_STALL = 0.1
+
+PUBLIC_DB_ENDPOINTS = [
+    ("/search/basic", {"name": "zelda"}),
+    ("/search/advanced", {"name": "zelda"}),
+    ("/games/", {}),
+    ("/locations/", {}),
+]
+
+
+_slow_budget = {"statements": 0}
+
+
+def _slow_statement(conn, cursor, statement, parameters, context, executemany):
+    # Only the first few statements of each request are slowed; that is enough to expose a stall
+    if _slow_budget["statements"] > 0:
+        _slow_budget["statements"] -= 1
+        time.sleep(DB_DELAY)
+
+
+async def _max_loop_stall(url: str, params: dict) -> float:
+    """
+    Run one request against the app while a heartbeat task measures the largest gap
+    between its ticks. Blocking DB work on the event loop shows up as a gap >= DB_DELAY.
+    """
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    probe = asyncio.create_task(heartbeat())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(url, params=params)
+    done.set()
+    await probe
+    assert resp.status_code == 200, (url, resp.text)
+    return stall
+
+
+def test_db_endpoints_do_not_block_event_loop():
+    event.listen(engine, "before_cursor_execute", _slow_statement)
+    try:
+        for url, params in PUBLIC_DB_ENDPOINTS:
+            _slow_budget["statements"] = 2
+            stall = asyncio.run(_max_loop_stall(url, params))
+            assert stall < MAX_LOOP_STALL, f"{url} blocked the event loop for {stall:.3f}s"
+    finally:
+        event.remove(engine, "before_cursor_execute", _slow_statement)
+
+
+def test_route_handlers_are_sync():
+    # Handlers do blocking SQLAlchemy work, so they must run in FastAPI's threadpool;
+    # IGDB coroutines are driven through utils.db_tools.run_blocking instead.
+    offenders = [
+        f"{','.join(sorted(route.methods))} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and inspect.iscoroutinefunction(route.endpoint)
+    ]
+    assert offenders == []
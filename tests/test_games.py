@@ -1,6 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from conftest import create_game
+
 @pytest.fixture(scope="module")
 def client():
     from conftest import get_authenticated_client
@@ -101,3 +103,41 @@ def test_delete_game(client: TestClient):
 
     resp_check = client.get(f"/games/{game_id}")
     assert resp_check.status_code == 404
+
+def test_list_games_pages_and_etag(client: TestClient):
+    everything = client.get("/games/")
+    assert everything.status_code == 200
+    etag = everything.headers["etag"]
+
+    walked, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/games/", params=params)
+        assert page.status_code == 200
+        assert len(page.json()) <= 2
+        walked += [g["id"] for g in page.json()]
+        cursor = page.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert walked == [g["id"] for g in everything.json()]
+
+    def status(if_none_match: str) -> int:
+        return client.get("/games/", headers={"If-None-Match": if_none_match}).status_code
+
+    assert status(etag) == 304
+    assert status(f'"other", {etag}') == 304
+    assert status(etag.removeprefix("W/")) == 304
+    assert status("*") == 304
+    assert status('W/"abc", "x"') == 200
+    assert status(etag[:-1] + '0"') == 200
+
+def test_game_and_export_carry_location_path(client: TestClient):
+    room = client.post("/locations/", params={"name": "Export Room"}).json()
+    shelf = client.post("/locations/", params={"name": "Export Shelf", "parent_id": room["id"]}).json()
+    game_id = create_game(client, "Shelved Game", location_id=shelf["id"])["id"]
+
+    got = client.get(f"/games/{game_id}").json()
+    assert [p["id"] for p in got["location_path"]] == [room["id"], shelf["id"]]
+
+    exported = {g["id"]: g for g in client.get("/export/games/json").json()}
+    assert [p["id"] for p in exported[game_id]["location_path"]] == [room["id"], shelf["id"]]
@@ -1,6 +1,8 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from conftest import create_game
+
 @pytest.fixture(scope="module")
 def client():
     from conftest import get_authenticated_client
@@ -91,3 +93,63 @@ def test_get_nonexistent_location_returns_404(client: TestClient):
     resp = client.get("/locations/999999")
     assert resp.status_code == 404
     assert resp.json()["detail"] == "Location not found"
+
+
+def test_reparent_location_moves_subtree(client: TestClient):
+    attic = client.post("/locations/", params={"name": "Reparent Attic"}).json()
+    garage = client.post("/locations/", params={"name": "Reparent Garage"}).json()
+    box = client.post("/locations/", params={"name": "Reparent Box", "parent_id": attic["id"]}).json()
+    bag = client.post("/locations/", params={"name": "Reparent Bag", "parent_id": box["id"]}).json()
+    game = create_game(client, "Reparented Game", location_id=bag["id"])
+
+    resp = client.put(f"/locations/{box['id']}/parent", json={"parent_id": garage["id"]})
+    assert resp.status_code == 200
+    assert resp.json()["parent_id"] == garage["id"]
+
+    path = client.get(f"/games/{game['id']}/location_path").json()["location_path"]
+    assert [p["id"] for p in path] == [garage["id"], box["id"], bag["id"]]
+
+    under_garage = client.get("/search/advanced", params={
+        "location_id": garage["id"], "include_location_descendants": "true",
+    }).json()["results"]
+    assert [g["id"] for g in under_garage] == [game["id"]]
+
+    # A location can't move beneath its own subtree
+    assert client.put(f"/locations/{box['id']}/parent", json={"parent_id": bag["id"]}).status_code == 400
+
+
+def test_location_tree_counts_and_etag(client: TestClient):
+    room = client.post("/locations/", params={"name": "Tree Room"}).json()
+    shelf = client.post("/locations/", params={"name": "Tree Shelf", "parent_id": room["id"]}).json()
+    for location_id in (room["id"], shelf["id"], shelf["id"]):
+        create_game(client, "Tree Game", location_id=location_id)
+
+    resp = client.get("/locations/tree")
+    assert resp.status_code == 200
+    node = next(n for n in resp.json() if n["id"] == room["id"])
+    assert (node["game_count"], node["subtree_game_count"]) == (1, 3)
+    assert [(c["id"], c["game_count"], c["subtree_game_count"]) for c in node["children"]] == [(shelf["id"], 2, 2)]
+
+    assert client.get("/locations/tree", headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+    # A rename changes no count but must still invalidate the tree
+    assert client.put(f"/locations/{shelf['id']}/rename", json={"name": "Tree Ledge"}).status_code == 200
+    assert client.get("/locations/tree", headers={"If-None-Match": resp.headers["etag"]}).status_code == 200
+
+
+def test_location_snapshot_is_reused_until_a_location_write(client: TestClient):
+    from gamecubby_api.utils.db_tools import with_db
+    from gamecubby_api.utils.location_cache import get_location_snapshot
+
+    room = client.post("/locations/", params={"name": "Snapshot Room"}).json()
+    with with_db() as db:
+        first = get_location_snapshot(db)
+        assert get_location_snapshot(db) is first
+        assert [p["id"] for p in first.path(room["id"])] == [room["id"]]
+
+    resp = client.put(f"/locations/{room['id']}/rename", json={"name": "Snapshot Den"})
+    assert resp.status_code == 200
+    with with_db() as db:
+        rebuilt = get_location_snapshot(db)
+        assert rebuilt is not first
+        assert [p["name"] for p in rebuilt.path(room["id"])] == ["Snapshot Den"]
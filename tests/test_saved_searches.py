@@ -0,0 +1,60 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from conftest import create_game
+
+
+def test_saved_search_materializes_and_follows_game_writes(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    first = create_game(client, f"Saved {token} A", tag_ids=[f"saved-{token}"])
+
+    resp = client.post("/search/saved/", json={"name": f"saved {token}", "params": {"name": f"saved {token}"}})
+    assert resp.status_code == 200
+    saved = resp.json()
+    assert saved["total"] == 1 and saved["stale"] is False
+
+    # A new matching game is logged by its write and patched into the set on the next view
+    second = create_game(client, f"Saved {token} B")
+    assert client.get(f"/search/saved/{saved['id']}").json()["stale"] is True
+    resp = client.get(f"/search/saved/{saved['id']}/results", params={"limit": 1, "count": "total"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [g["id"] for g in body["results"]] == [first["id"]]
+    assert body["total"] == 2 and body["next_cursor"]
+    assert client.get(f"/search/saved/{saved['id']}").json()["stale"] is False
+
+    resp = client.get(f"/search/saved/{saved['id']}/results", params={"limit": 1, "cursor": body["next_cursor"]})
+    assert [g["id"] for g in resp.json()["results"]] == [second["id"]]
+
+    # Deleting a game drops it from the set
+    assert client.delete(f"/games/{second['id']}").status_code == 200
+    resp = client.get(f"/search/saved/{saved['id']}/results")
+    assert [g["id"] for g in resp.json()["results"]] == [first["id"]]
+
+    assert client.post("/search/saved/", json={"name": f"saved {token}", "params": {"year": 1995}}).status_code == 409
+    assert client.post("/search/saved/", json={"name": f"empty {token}", "params": {}}).status_code == 400
+
+    assert client.delete(f"/search/saved/{saved['id']}").status_code == 200
+    assert client.get(f"/search/saved/{saved['id']}").status_code == 404
+
+
+def test_saved_search_follows_location_renames(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    attic = client.post("/locations/", params={"name": f"Attic {token}"}).json()
+    box = client.post("/locations/", params={"name": f"Box {token}", "parent_id": attic["id"]}).json()
+    game = create_game(client, f"Renamed {token}", location_id=box["id"])
+
+    resp = client.post("/search/saved/", json={"name": f"attic {token}", "params": {"q": f'loc:"Attic {token}"'}})
+    assert resp.status_code == 200
+    saved = resp.json()
+    assert saved["total"] == 1
+
+    resp = client.put(f"/locations/{attic['id']}/rename", json={"name": f"Loft {token}"})
+    assert resp.status_code == 200
+    resp = client.get(f"/search/saved/{saved['id']}/results")
+    assert resp.json()["results"] == []
+
+    client.put(f"/locations/{attic['id']}/rename", json={"name": f"Attic {token}"})
+    resp = client.get(f"/search/saved/{saved['id']}/results")
+    assert [g["id"] for g in resp.json()["results"]] == [game["id"]]
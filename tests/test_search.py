@@ -0,0 +1,458 @@
+import base64
+import json
+import uuid
+
+from fastapi.testclient import TestClient
+
+from conftest import create_game
+
+
+def test_basic_search_by_name(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Chrono Quest {token}")
+
+    resp = client.get("/search/basic", params={"name": f"quest {token}"})
+    assert resp.status_code == 200
+    ids = [g["id"] for g in resp.json()["results"]]
+    assert game["id"] in ids
+
+
+def test_fuzzy_name_search_tolerates_typos(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Zelda Adventure {token}")
+
+    resp = client.get("/search/advanced", params={
+        "name": f"zelad adventure {token}",
+        "name_match": "fuzzy",
+    })
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert results and results[0]["id"] == game["id"]
+
+
+def test_fuzzy_threshold_is_validated(client: TestClient):
+    resp = client.get("/search/basic", params={"name": "zelda", "name_match": "fuzzy", "fuzzy_threshold": "2"})
+    assert resp.status_code == 422
+
+
+def test_fulltext_search_matches_summary(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Quiet Harbor {token}", summary=f"A lighthouse keeper {token} solves puzzles.")
+
+    resp = client.get("/search/fulltext", params={"q": f"lighthouse {token}"})
+    assert resp.status_code == 200
+    ids = [g["id"] for g in resp.json()["results"]]
+    assert ids == [game["id"]]
+
+
+def test_cursor_pagination_walks_all_pages(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    created = [create_game(client, f"Paging {token} {n}")["id"] for n in range(5)]
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params = {"name": f"paging {token}", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/search/advanced", params=params)
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(g["id"] for g in body["results"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == created
+
+
+def test_invalid_cursor_is_rejected(client: TestClient):
+    resp = client.get("/search/basic", params={"name": "paging", "cursor": "not-a-cursor"})
+    assert resp.status_code == 422
+
+
+def test_cursor_is_bound_to_its_sort_and_value_types(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    for suffix in "ABC":
+        create_game(client, f"Bound {token} {suffix}")
+    first = client.get("/search/basic", params={"name": f"bound {token}", "limit": 1}).json()
+    cursor = first["next_cursor"]
+
+    # A name-sort cursor replayed under another sort or direction
+    for sort in ("year", "-name", "added"):
+        resp = client.get("/search/basic", params={"name": f"bound {token}", "sort": sort, "cursor": cursor})
+        assert resp.status_code == 422
+
+    # Well-formed JSON whose values don't have the sort column's types
+    forged = base64.urlsafe_b64encode(json.dumps({"sort": "name", "desc": False, "after": [{}, 1]}).encode()).decode()
+    assert client.get("/search/basic", params={"cursor": forged}).status_code == 422
+    forged = base64.urlsafe_b64encode(json.dumps({"sort": "year", "desc": False, "after": ["x", "1"]}).encode()).decode()
+    assert client.get("/search/basic", params={"sort": "year", "cursor": forged}).status_code == 422
+
+
+def test_search_results_carry_location_path(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    room = client.post("/locations/", params={"name": f"Room {token}"}).json()
+    shelf = client.post("/locations/", params={"name": f"Shelf {token}", "parent_id": room["id"]}).json()
+    game = create_game(client, f"Pathfinder {token}", location_id=shelf["id"])
+
+    resp = client.get("/search/advanced", params={"name": f"pathfinder {token}"})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [g["id"] for g in results] == [game["id"]]
+    assert [p["id"] for p in results[0]["location_path"]] == [room["id"], shelf["id"]]
+
+
+def _count_queries(client: TestClient, url: str, params: dict) -> tuple[int, dict]:
+    from sqlalchemy import event
+    from gamecubby_api.db import engine
+
+    statements: list[str] = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        # the search-generation lookup is TTL-cached, so it may or may not run on a given request
+        if "app_config" not in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+    try:
+        resp = client.get(url, params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_execute)
+    assert resp.status_code == 200
+    return len(statements), resp.json()
+
+
+def test_search_query_count_is_independent_of_page_size(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    for n in range(4):
+        create_game(client, f"Eager {token} {n}", tag_ids=[f"eager-{token}-{n}", f"eager-{token}"])
+
+    one, body_one = _count_queries(client, "/search/advanced", {"name": f"eager {token}", "limit": 1})
+    four, body_four = _count_queries(client, "/search/advanced", {"name": f"eager {token}", "limit": 4})
+
+    assert len(body_one["results"]) == 1
+    assert len(body_four["results"]) == 4
+    assert all(len(g["tags"]) == 2 for g in body_four["results"])
+    # 1 page query + 7 SELECT IN loads + 1 location-path CTE, regardless of row count
+    assert one == four
+    assert four <= 10
+
+
+def test_tag_match_modes(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    red, blue = f"red-{token}", f"blue-{token}"
+    only_red = create_game(client, f"Modes {token} A", tag_ids=[red])
+    red_blue = create_game(client, f"Modes {token} B", tag_ids=[red, blue])
+    tag_ids = {t["name"]: t["id"] for t in red_blue["tags"]}
+
+    def found(mode: str, names: list[str]) -> set[int]:
+        resp = client.get("/search/advanced", params={
+            "name": f"modes {token}",
+            "tag_ids": [tag_ids[n] for n in names],
+            "match_mode": mode,
+        })
+        assert resp.status_code == 200
+        return {g["id"] for g in resp.json()["results"]}
+
+    assert found("any", [red, blue]) == {only_red["id"], red_blue["id"]}
+    assert found("all", [red, blue]) == {red_blue["id"]}
+    assert found("exact", [red]) == {only_red["id"]}
+    assert found("exact", [red, blue]) == {red_blue["id"]}
+
+
+def test_facet_counts_follow_advanced_filters(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    shared, extra = f"facet-{token}", f"facet-extra-{token}"
+    create_game(client, f"Facets {token} A", release_date=1991, tag_ids=[shared])
+    create_game(client, f"Facets {token} B", release_date=1994, tag_ids=[shared, extra])
+    create_game(client, f"Facets {token} C", release_date=2003, tag_ids=[shared])
+
+    resp = client.get("/search/facets", params={"name": f"facets {token}"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 3
+    tags = {t["name"]: t["count"] for t in body["facets"]["tags"]}
+    assert tags == {shared: 3, extra: 1}
+    assert body["facets"]["decades"] == [{"decade": 1990, "count": 2}, {"decade": 2000, "count": 1}]
+
+    resp = client.get("/search/facets", params={"name": f"facets {token}", "year_max": 1999})
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 2
+
+
+def test_search_cache_hits_and_invalidation(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    first = create_game(client, f"Cached {token} A")
+
+    params = [("name", f"cached {token}"), ("limit", "10")]
+    resp = client.get("/search/advanced", params=params)
+    assert [g["id"] for g in resp.json()["results"]] == [first["id"]]
+
+    before = client.get("/search/cache/stats").json()
+    resp = client.get("/search/advanced", params=list(reversed(params)))
+    after = client.get("/search/cache/stats").json()
+    assert [g["id"] for g in resp.json()["results"]] == [first["id"]]
+    assert after["hits"] == before["hits"] + 1
+
+    # Any game write bumps the generation, so the cached page must not be served again
+    second = create_game(client, f"Cached {token} B")
+    resp = client.get("/search/advanced", params=params)
+    assert [g["id"] for g in resp.json()["results"]] == [first["id"], second["id"]]
+
+
+def test_suggestions_rank_prefix_matches_first_and_see_new_rows(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    infix = create_game(client, f"Super {token} Bros")
+    prefix = create_game(client, f"{token} Saga")
+
+    resp = client.get("/search/suggest/names", params={"q": token.upper()})
+    assert resp.status_code == 200
+    assert resp.json()["suggestions"] == [prefix["name"], infix["name"]]
+
+    # Written after the index was built: must show up on the next lookup
+    create_game(client, f"Another {token}", tag_ids=[f"suggest-{token}"])
+    resp = client.get("/search/suggest/tags", params={"q": f"gest-{token}"})
+    assert resp.status_code == 200
+    assert [t["name"] for t in resp.json()["suggestions"]] == [f"suggest-{token}"]
+
+
+def test_suggest_index_only_reloads_for_its_own_entity(client: TestClient):
+    from gamecubby_api.utils.db_tools import with_db
+    from gamecubby_api.utils.suggest_index import get_suggest_index
+
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Reload {token}", tag_ids=[f"reload-{token}"])
+    with with_db() as db:
+        tags = get_suggest_index(db, "tags")
+        names = get_suggest_index(db, "names")
+
+    # A rename reloads the game names, but leaves the tag index alone
+    resp = client.put(f"/games/{game['id']}", json={"name": f"Renamed {token}", "condition": 3})
+    assert resp.status_code == 200
+    with with_db() as db:
+        assert get_suggest_index(db, "tags") is tags
+        assert get_suggest_index(db, "names") is not names
+
+    resp = client.get("/search/suggest/names", params={"q": f"renamed {token}"})
+    assert resp.json()["suggestions"] == [f"Renamed {token}"]
+
+
+def test_unified_suggest_groups_by_entity_type(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Unified {token}", tag_ids=[f"unified-{token}"])
+
+    resp = client.get("/search/suggest", params={"q": token})
+    assert resp.status_code == 200
+    groups = resp.json()["suggestions"]
+    assert set(groups) == {"names", "tags", "igdb_tags", "genres", "modes", "collections", "companies"}
+
+    resp = client.get("/search/suggest", params={"q": token, "types": ["names", "tags"]})
+    assert resp.status_code == 200
+    groups = resp.json()["suggestions"]
+    assert [g["id"] for g in groups["names"]] == [game["id"]]
+    assert [t["name"] for t in groups["tags"]] == [f"unified-{token}"]
+    assert set(groups) == {"names", "tags"}
+
+    assert client.get("/search/suggest", params={"q": token, "types": "bogus"}).status_code == 422
+
+
+def test_fields_projection_trims_search_and_game_payloads(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Projected {token}", summary="long text", tag_ids=[f"proj-{token}"])
+
+    resp = client.get("/search/advanced", params={"name": f"projected {token}", "fields": "card"})
+    assert resp.status_code == 200
+    card = resp.json()["results"][0]
+    assert set(card) == {"id", "name", "cover_url", "platforms"}
+
+    resp = client.get("/search/basic", params={"name": f"projected {token}", "fields": "list"})
+    assert resp.status_code == 200
+    row = resp.json()["results"][0]
+    assert "summary" not in row and "companies" not in row
+    assert [t["name"] for t in row["tags"]] == [f"proj-{token}"]
+
+    resp = client.get(f"/games/{game['id']}", params={"fields": "card"})
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"id", "name", "cover_url", "platforms"}
+    assert client.get(f"/games/{game['id']}").json()["summary"] == "long text"
+
+    assert client.get("/search/advanced", params={"name": token, "fields": "bogus"}).status_code == 422
+
+
+def test_total_and_has_more_page_metadata(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    for n in range(5):
+        create_game(client, f"Counted {token} {n}")
+
+    params = {"name": f"counted {token}", "limit": 2, "count": "total"}
+    first = client.get("/search/advanced", params=params).json()
+    assert first["total"] == 5 and first["has_more"] is True
+
+    second = client.get("/search/advanced", params={**params, "cursor": first["next_cursor"]}).json()
+    assert second["total"] == 5 and len(second["results"]) == 2
+
+    last = client.get("/search/basic", params={**params, "offset": 4, "count": "has_more"}).json()
+    assert last["has_more"] is False and "total" not in last
+
+    past_end = client.get("/search/basic", params={**params, "offset": 10}).json()
+    assert past_end["results"] == [] and past_end["total"] == 5
+
+    assert "total" not in client.get("/search/advanced", params={"name": f"counted {token}"}).json()
+    assert client.get("/search/basic", params={**params, "count": "bogus"}).status_code == 422
+
+
+def test_advanced_search_streams_ndjson(client: TestClient):
+    import json
+
+    token = uuid.uuid4().hex[:8]
+    games = [create_game(client, f"Streamed {token} {n}") for n in range(3)]
+
+    params = {"name": f"streamed {token}", "fields": "card"}
+    resp = client.get("/search/advanced", params=params, headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["id"] for r in rows] == [g["id"] for g in games]
+    assert rows == client.get("/search/advanced", params=params).json()["results"]
+
+    resp = client.get(
+        "/search/advanced",
+        params={**params, "cursor": "junk"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert resp.status_code == 422
+
+
+def test_name_search_ignores_accents_and_punctuation(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Pokémon: Let's Go {token}")
+
+    for needle in (f"pokemon lets go {token}", f"POKEMON-LETS-GO-{token}"):
+        resp = client.get("/search/basic", params={"name": needle})
+        assert [g["id"] for g in resp.json()["results"]] == [game["id"]]
+
+    resp = client.get("/search/advanced", params={"name": f"pokemn lets go {token}", "name_match": "fuzzy"})
+    assert game["id"] in [g["id"] for g in resp.json()["results"]]
+
+    resp = client.get("/search/suggest/names", params={"q": f"mon: lets-go {token}"})
+    assert game["name"] in resp.json()["suggestions"]
+
+
+def test_results_use_natural_sort_order(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    ten = create_game(client, f"Natural {token} 10")
+    nine = create_game(client, f"Natural {token} 9")
+    the = create_game(client, f"The Natural {token} 3")
+
+    resp = client.get("/search/advanced", params={"name": f"natural {token}"})
+    assert [g["id"] for g in resp.json()["results"]] == [the["id"], nine["id"], ten["id"]]
+
+    # Keyset pages follow the same order
+    first = client.get("/search/basic", params={"name": f"natural {token}", "limit": 2}).json()
+    rest = client.get("/search/basic", params={"name": f"natural {token}", "limit": 2, "cursor": first["next_cursor"]})
+    assert [g["id"] for g in first["results"] + rest.json()["results"]] == [the["id"], nine["id"], ten["id"]]
+
+
+def test_facet_arrays_follow_tag_deletes(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    game = create_game(client, f"Arrays {token}", tag_ids=[f"keep-{token}", f"drop-{token}"])
+    tag_ids = {t["name"]: t["id"] for t in game["tags"]}
+
+    def exact(ids: list[int]) -> list[int]:
+        resp = client.get("/search/advanced", params={"name": f"arrays {token}", "tag_ids": ids, "match_mode": "exact"})
+        assert resp.status_code == 200
+        return [g["id"] for g in resp.json()["results"]]
+
+    assert exact([tag_ids[f"keep-{token}"]]) == []
+    assert client.delete(f"/tags/{tag_ids[f'drop-{token}']}").status_code == 200
+    assert exact([tag_ids[f"keep-{token}"]]) == [game["id"]]
+
+
+def test_facet_index_follows_game_writes(client: TestClient, monkeypatch):
+    from gamecubby_api.utils import search
+    monkeypatch.setattr(search, "FACET_INDEX_ENABLED", True)
+
+    token = uuid.uuid4().hex[:8]
+    red, blue = f"idx-red-{token}", f"idx-blue-{token}"
+    first = create_game(client, f"Indexed {token} A", tag_ids=[red])
+    second = create_game(client, f"Indexed {token} B", tag_ids=[red, blue])
+    tag_ids = {t["name"]: t["id"] for t in second["tags"]}
+
+    def found(names: list[str], mode: str = "all") -> list[int]:
+        resp = client.get("/search/advanced", params={
+            "name": f"indexed {token}",
+            "tag_ids": [tag_ids[n] for n in names],
+            "match_mode": mode,
+        })
+        assert resp.status_code == 200
+        return [g["id"] for g in resp.json()["results"]]
+
+    assert found([red, blue]) == [second["id"]]
+    assert found([red], "exact") == [first["id"]]
+
+    resp = client.put(f"/games/{first['id']}", json={"tag_ids": [tag_ids[blue]]})
+    assert resp.status_code == 200
+    assert found([red]) == [second["id"]]
+    assert found([blue], "exact") == [first["id"]]
+
+    assert client.delete(f"/games/{second['id']}").status_code == 200
+    assert found([blue], "any") == [first["id"]]
+
+
+def test_query_language_combines_terms(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    attic = client.post("/locations/", params={"name": f"Attic {token}"}).json()
+    box = client.post("/locations/", params={"name": f"Box {token}", "parent_id": attic["id"]}).json()
+    boxed = create_game(client, f"Query {token} A", release_date=1992, location_id=box["id"], tag_ids=[f"boxed-{token}"])
+    create_game(
+        client, f"Query {token} B", release_date=1993, location_id=box["id"],
+        tag_ids=[f"boxed-{token}", f"loose-{token}"],
+    )
+    create_game(client, f"Query {token} C", release_date=1999, location_id=attic["id"], tag_ids=[f"boxed-{token}"])
+
+    q = f'query {token} year:1990..1995 tag:boxed-{token} -tag:loose-{token} loc:"Attic {token}"'
+    resp = client.get("/search/advanced", params={"q": q})
+    assert resp.status_code == 200
+    assert [g["id"] for g in resp.json()["results"]] == [boxed["id"]]
+
+    assert client.get("/search/advanced", params={"q": "bogus:1"}).status_code == 422
+    assert client.get("/search/advanced", params={"q": "year:1995..1990"}).status_code == 422
+
+
+def test_sort_options_page_in_both_directions(client: TestClient):
+    token = uuid.uuid4().hex[:8]
+    old = create_game(client, f"Sorted {token} A", release_date=1985)
+    new = create_game(client, f"Sorted {token} B", release_date=2001)
+    mid = create_game(client, f"Sorted {token} C", release_date=1994)
+
+    def walk(sort: str) -> list[int]:
+        params = {"name": f"sorted {token}", "sort": sort, "limit": 2}
+        first = client.get("/search/basic", params=params).json()
+        rest = client.get("/search/basic", params={**params, "cursor": first["next_cursor"]}).json()
+        return [g["id"] for g in first["results"] + rest["results"]]
+
+    assert walk("year") == [old["id"], mid["id"], new["id"]]
+    assert walk("-year") == [new["id"], mid["id"], old["id"]]
+    assert client.get("/search/basic", params={"sort": "bogus"}).status_code == 422
+
+
+def test_query_language_matches_igdb_vocabulary_words_and_keeps_undated_games(client: TestClient):
+    from gamecubby_api.models.genre import Genre
+    from gamecubby_api.utils.db_tools import with_db
+
+    token = uuid.uuid4().hex[:8]
+    genre_id = 900_000_000 + int(token[:6], 16)
+    with with_db() as db:
+        db.add(Genre(id=genre_id, name=f"Role-playing (RPG) {token}"))
+        db.commit()
+
+    rpg = create_game(client, f"Vocab {token} A", release_date=1993, genre_ids=[genre_id])
+    undated = create_game(client, f"Vocab {token} B", release_date=None)
+
+    resp = client.get("/search/advanced", params={"q": f"vocab {token} genre:rpg"})
+    assert resp.status_code == 200
+    assert [g["id"] for g in resp.json()["results"]] == [rpg["id"]]
+
+    resp = client.get("/search/advanced", params={"q": f"vocab {token} -year:1990..1995"})
+    assert [g["id"] for g in resp.json()["results"]] == [undated["id"]]